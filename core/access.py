@@ -0,0 +1,87 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import Project
+
+
+def _cache_key(user_id):
+    return f'access:projects:{user_id}'
+
+
+def visible_project_ids(user):
+    """Return the ids of the projects ``user`` is a member or the creator of."""
+    if not user.is_authenticated:
+        return frozenset()
+
+    # Memoized on the user object, which lives as long as the request
+    ids = getattr(user, '_visible_project_ids', None)
+    if ids is None:
+        key = _cache_key(user.pk)
+        ids = cache.get(key)
+        if ids is None:
+            member_of = Project.members.through.objects.filter(user_id=user.pk).values_list(
+                'project_id', flat=True
+            )
+            created = Project.objects.filter(created_by_id=user.pk).order_by().values_list(
+                'pk', flat=True
+            )
+            ids = frozenset(member_of.union(created))
+            cache.set(key, ids, settings.ACCESS_CACHE_TIMEOUT)
+        user._visible_project_ids = ids
+    return ids
+
+
+def can_view_project(user, project_id):
+    if user.is_super_admin:
+        return True
+    return project_id in visible_project_ids(user)
+
+
+def users_for_projects(project_ids):
+    """Return the ids of the members and creators of ``project_ids``."""
+    project_ids = [pk for pk in project_ids if pk is not None]
+    if not project_ids:
+        return set()
+    members = Project.members.through.objects.filter(project_id__in=project_ids)
+    creators = Project.objects.filter(pk__in=project_ids)
+    return (
+        set(members.values_list('user_id', flat=True))
+        | set(creators.values_list('created_by_id', flat=True))
+    )
+
+
+def invalidate(user_ids):
+    keys = [_cache_key(pk) for pk in user_ids if pk is not None]
+    if keys:
+        cache.delete_many(keys)
+        # Also drop them once the transaction commits, in case a concurrent
+        # request re-cached the old set in between
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_loaded_values', {})
+    if created or previous.get('created_by_id') != instance.created_by_id:
+        invalidate({instance.created_by_id, previous.get('created_by_id')})
+
+
+@receiver(pre_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    invalidate(users_for_projects({instance.pk}))
+
+
+@receiver(m2m_changed, sender=Project.members.through)
+def project_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            invalidate({instance.pk})
+    elif action == 'pre_clear':
+        invalidate(set(instance.members.values_list('pk', flat=True)))
+    elif action in ('post_add', 'post_remove'):
+        invalidate(pk_set or set())
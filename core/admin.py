@@ -1,6 +1,82 @@
+from django.conf import settings
 from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, Project, Task, WorkLog, TaskHistory
+from django.core.paginator import Paginator
+from django.db.models import F
+from django.utils.functional import cached_property
+from . import search
+from .models import User, Project, Task, WorkLog, TaskHistory, ArchivedTaskHistory
+
+
+class CappedCountPaginator(Paginator):
+    # Count at most ADMIN_EXACT_COUNT_LIMIT rows; beyond that the changelist
+    # pages through the first ADMIN_EXACT_COUNT_LIMIT and says there are more
+    # (templates/admin/pagination.html)
+    capped = False
+
+    @cached_property
+    def count(self):
+        limit = settings.ADMIN_EXACT_COUNT_LIMIT
+        count = self.object_list.order_by()[:limit + 1].count()
+        if count <= limit:
+            return count
+        self.capped = True
+        return limit
+
+
+class AutocompleteFilter(admin.FieldListFilter):
+    # A foreign key filter that searches the related admin instead of listing
+    # every related object; the related admin needs search_fields
+    template = 'admin/core/autocomplete_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.lookup_kwarg = f'{field_path}__{field.target_field.name}__exact'
+        super().__init__(field, request, params, model, model_admin, field_path)
+        value = self.used_parameters.get(self.lookup_kwarg)
+        self.lookup_val = value[-1] if isinstance(value, list) else value
+        self.widget = AutocompleteSelect(field, model_admin.admin_site)
+        self.form_field = field.formfield(widget=self.widget, required=False)
+
+    def has_output(self):
+        return True
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg]
+
+    def choices(self, changelist):
+        yield {
+            'selected': self.lookup_val is None,
+            'query_string': changelist.get_query_string(remove=[self.lookup_kwarg]),
+            'display': 'All',
+        }
+
+    def render_widget(self):
+        return self.form_field.widget.render(self.lookup_kwarg, self.lookup_val, attrs={
+            'id': f'autocomplete-filter-{self.field_path}',
+            'data-filter-param': self.lookup_kwarg,
+        })
+
+
+class ChangeListPerformanceMixin:
+    # Bounded counts on huge tables, and the select2 assets the autocomplete
+    # filters need on the changelist page
+    paginator = CappedCountPaginator
+    show_full_result_count = False
+
+    @property
+    def media(self):
+        return super().media + AutocompleteSelect(None, self.admin_site).media
+
+
+class FullTextSearchMixin:
+    # Answer the changelist search box from the FTS index instead of LIKE scans
+    search_kind = None
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search.is_available() or search.build_match(search_term) is None:
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(pk__in=search.matching_pks(self.search_kind, search_term)), False
 
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
@@ -14,27 +90,64 @@ class UserAdmin(BaseUserAdmin):
     )
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(ChangeListPerformanceMixin, FullTextSearchMixin, admin.ModelAdmin):
+    search_kind = 'project'
     list_display = ('name', 'created_by', 'is_active', 'total_tasks', 'completed_tasks', 'created_at')
-    list_filter = ('is_active', 'created_at', 'created_by')
+    list_filter = ('is_active', 'created_at', ('created_by', AutocompleteFilter))
+    list_select_related = ('created_by',)
     search_fields = ('name', 'description')
     filter_horizontal = ('members',)
+    readonly_fields = ('todo_count', 'in_progress_count', 'done_count')
+
+    # Read from the denormalized counters, so sorting needs no join either
+    @admin.display(description='Total tasks', ordering=F('todo_count') + F('in_progress_count') + F('done_count'))
+    def total_tasks(self, obj):
+        return obj.total_tasks
+
+    @admin.display(description='Completed tasks', ordering='done_count')
+    def completed_tasks(self, obj):
+        return obj.completed_tasks
 
 @admin.register(Task)
-class TaskAdmin(admin.ModelAdmin):
+class TaskAdmin(ChangeListPerformanceMixin, FullTextSearchMixin, admin.ModelAdmin):
+    search_kind = 'task'
     list_display = ('title', 'project', 'assignee', 'status', 'priority', 'due_date', 'created_at')
-    list_filter = ('status', 'priority', 'project', 'assignee', 'created_at')
+    list_filter = (
+        'status', 'priority', ('project', AutocompleteFilter),
+        ('assignee', AutocompleteFilter), 'created_at',
+    )
+    list_select_related = ('project', 'assignee')
     search_fields = ('title', 'description')
     list_editable = ('status', 'priority')
+    autocomplete_fields = ('project', 'assignee', 'created_by')
 
 @admin.register(WorkLog)
-class WorkLogAdmin(admin.ModelAdmin):
+class WorkLogAdmin(ChangeListPerformanceMixin, FullTextSearchMixin, admin.ModelAdmin):
+    search_kind = 'worklog'
     list_display = ('user', 'project', 'task', 'hours_spent', 'date', 'created_at')
-    list_filter = ('user', 'project', 'date', 'created_at')
+    list_filter = (('user', AutocompleteFilter), ('project', AutocompleteFilter), 'date', 'created_at')
+    # Task.__str__ includes the project name
+    list_select_related = ('user', 'project', 'task__project')
     search_fields = ('description',)
+    autocomplete_fields = ('user', 'project', 'task')
 
 @admin.register(TaskHistory)
-class TaskHistoryAdmin(admin.ModelAdmin):
+class TaskHistoryAdmin(ChangeListPerformanceMixin, admin.ModelAdmin):
+    list_display = ('task', 'user', 'action', 'created_at')
+    list_filter = ('action', ('user', AutocompleteFilter), 'created_at')
+    list_select_related = ('task__project', 'user')
+    readonly_fields = ('created_at',)
+    autocomplete_fields = ('task', 'user')
+
+@admin.register(ArchivedTaskHistory)
+class ArchivedTaskHistoryAdmin(ChangeListPerformanceMixin, admin.ModelAdmin):
+    # Written only by the archive_task_history command
     list_display = ('task', 'user', 'action', 'created_at')
-    list_filter = ('action', 'user', 'created_at')
-    readonly_fields = ('created_at',)
\ No newline at end of file
+    list_filter = ('action', ('user', AutocompleteFilter), 'created_at')
+    list_select_related = ('task__project', 'user')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,246 @@
+from collections import Counter
+from datetime import date
+from itertools import accumulate
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q
+from django.db.models.functions import TruncDate
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import history
+from .models import Task, User
+
+# Burndown, cycle time and velocity per project, rebuilt from the task
+# history of both stores.
+#
+# A task is opened by its "created" row and completed by each status change
+# to done, or by the "created" row itself when it was created done (the row's
+# new_value holds the initial status); a change away from done reopens it.
+# Cycle time runs from creation to the first completion, which is also what
+# counts towards the velocity of the task's assignee.
+#
+# History ids only grow, so the state kept in the cache per project records
+# the last id it has seen and each call only reads the rows added since.
+# Events are aggregated in the database, per day and per task, and the rows
+# of large projects are streamed ANALYTICS_CHUNK_SIZE at a time. Deleting a
+# task or moving it to another project drops the state of the projects
+# involved, since that rewrites history the cursor has already passed.
+
+DONE = 'done'
+CREATED = Q(action='created')
+COMPLETED = Q(action='status_changed', new_value=DONE) | Q(action='created', new_value=DONE)
+REOPENED = Q(action='status_changed', old_value=DONE) & ~Q(new_value=DONE)
+
+PERCENTILES = [('median', 0.5), ('p85', 0.85)]
+
+
+def _cache_key(project_id):
+    return f'analytics:project:{project_id}'
+
+
+def _new_state():
+    return {
+        'cursor': 0,
+        # day ordinal -> [opened, completed, reopened]
+        'days': {},
+        # task id -> creation timestamp, until the task is first completed
+        'pending': {},
+        # (week ordinal, whole hours) -> first completions
+        'cycles': Counter(),
+        # (assignee id, week ordinal) -> first completions
+        'velocity': Counter(),
+    }
+
+
+def _week(day):
+    """Return the ordinal of the Monday starting ``day``'s week."""
+    return day.toordinal() - day.weekday()
+
+
+def latest_history_id():
+    return max(
+        model.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        for model in history.STORES
+    )
+
+
+def _events(project_id, after, until):
+    for model in history.STORES:
+        yield model.objects.filter(
+            task__project_id=project_id, id__gt=after, id__lte=until,
+        ).filter(CREATED | COMPLETED | REOPENED).order_by()
+
+
+def _apply(state, project_id, until):
+    days = state['days']
+    tasks = {}
+    for events in _events(project_id, state['cursor'], until):
+        per_day = events.values(day=TruncDate('created_at')).annotate(
+            opened=Count('id', filter=CREATED),
+            completed=Count('id', filter=COMPLETED),
+            reopened=Count('id', filter=REOPENED),
+        )
+        for row in per_day:
+            counts = days.setdefault(row['day'].toordinal(), [0, 0, 0])
+            counts[0] += row['opened']
+            counts[1] += row['completed']
+            counts[2] += row['reopened']
+
+        per_task = events.filter(CREATED | COMPLETED).values('task_id').annotate(
+            created=Min('created_at', filter=CREATED),
+            completed=Min('created_at', filter=COMPLETED),
+            assignee_id=Max('task__assignee_id'),
+        )
+        for row in per_task.iterator(chunk_size=settings.ANALYTICS_CHUNK_SIZE):
+            # A task's rows may be split between the archive and the live table
+            seen = tasks.get(row['task_id'])
+            if seen is not None:
+                row['created'] = min(filter(None, [seen['created'], row['created']]), default=None)
+                row['completed'] = min(filter(None, [seen['completed'], row['completed']]), default=None)
+            tasks[row['task_id']] = row
+
+    pending = state['pending']
+    for task_id, row in tasks.items():
+        if row['created'] is not None:
+            pending[task_id] = row['created'].timestamp()
+        # Not pending: completed before, or created before the history began
+        if row['completed'] is None or task_id not in pending:
+            continue
+        hours = int((row['completed'].timestamp() - pending.pop(task_id)) // 3600)
+        week = _week(timezone.localdate(row['completed']))
+        state['cycles'][(week, max(hours, 0))] += 1
+        state['velocity'][(row['assignee_id'], week)] += 1
+    state['cursor'] = until
+
+
+def get_state(project_id):
+    """Return the project's cached state, brought up to the latest history row."""
+    key = _cache_key(project_id)
+    state = cache.get(key) or _new_state()
+    latest = latest_history_id()
+    if latest > state['cursor']:
+        _apply(state, project_id, latest)
+        cache.set(key, state, settings.ANALYTICS_CACHE_TIMEOUT)
+    return state
+
+
+def _percentile(histogram, count, fraction):
+    rank = fraction * count
+    seen = 0
+    for hours in sorted(histogram):
+        seen += histogram[hours]
+        if seen >= rank:
+            return hours
+    return None
+
+
+def _days(hours):
+    return round(hours / 24, 1) if hours is not None else None
+
+
+def project_report(project_id, start=None, end=None):
+    """Return the burndown, cycle time and velocity series of a project.
+
+    Daily series run from ``start`` (default: the first event) to ``end``
+    (default: today); weekly series cover the weeks those days fall in.
+    """
+    state = get_state(project_id)
+    days = state['days']
+    end = end or timezone.localdate()
+    first = min(days, default=end.toordinal())
+    lo = max(start.toordinal(), first) if start else first
+    hi = max(end.toordinal(), lo)
+
+    ordinals = range(lo, hi + 1)
+    counts = [days.get(ordinal, (0, 0, 0)) for ordinal in ordinals]
+    # Tasks still open at the end of the day before the range
+    initial = sum(
+        opened - completed + reopened
+        for ordinal, (opened, completed, reopened) in days.items() if ordinal < lo
+    )
+    remaining = list(accumulate(
+        (opened - completed + reopened for opened, completed, reopened in counts),
+        initial=initial,
+    ))[1:]
+
+    weeks = range(_week(date.fromordinal(lo)), hi + 1, 7)
+    week_index = {week: index for index, week in enumerate(weeks)}
+
+    histogram = Counter()
+    weekly = [[0, 0] for _ in weeks]
+    for (week, hours), count in state['cycles'].items():
+        if week in week_index:
+            histogram[hours] += count
+            weekly[week_index[week]][0] += count
+            weekly[week_index[week]][1] += hours * count
+    completions = sum(histogram.values())
+    cycle_time = {
+        'completed': completions,
+        'average_days': _days(sum(h * n for h, n in histogram.items()) / completions) if completions else None,
+        **{
+            f'{name}_days': _days(_percentile(histogram, completions, fraction))
+            for name, fraction in PERCENTILES
+        },
+        'weekly': [
+            {'completed': count, 'average_days': _days(total / count) if count else None}
+            for count, total in weekly
+        ],
+    }
+
+    per_assignee = {}
+    for (assignee_id, week), count in state['velocity'].items():
+        if week in week_index:
+            series = per_assignee.setdefault(assignee_id, [0] * len(weeks))
+            series[week_index[week]] += count
+    usernames = dict(User.objects.filter(pk__in=per_assignee).values_list('pk', 'username'))
+    velocity = sorted(
+        (
+            {
+                'user_id': assignee_id,
+                'username': usernames.get(assignee_id),
+                'completed': series,
+                'total': sum(series),
+            }
+            for assignee_id, series in per_assignee.items()
+        ),
+        key=lambda row: (-row['total'], row['username'] or ''),
+    )
+
+    return {
+        'start': date.fromordinal(lo).isoformat(),
+        'end': date.fromordinal(hi).isoformat(),
+        'history_id': state['cursor'],
+        'burndown': {
+            'days': [date.fromordinal(ordinal).isoformat() for ordinal in ordinals],
+            'opened': [count[0] for count in counts],
+            'completed': [count[1] for count in counts],
+            'reopened': [count[2] for count in counts],
+            'remaining': remaining,
+        },
+        'weeks': [date.fromordinal(week).isoformat() for week in weeks],
+        'cycle_time': cycle_time,
+        'velocity': velocity,
+    }
+
+
+def invalidate(project_ids):
+    keys = [_cache_key(project_id) for project_id in project_ids]
+    cache.delete_many(keys)
+    # Also drop them once the transaction commits, in case a concurrent
+    # request rebuilt the state from the rows this one is deleting or moving
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def task_changed(sender, instance, raw=False, created=False, **kwargs):
+    if raw or created:
+        return
+    # _loaded_values still holds the state from before this save
+    previous = getattr(instance, '_loaded_values', {}).get('project_id', instance.project_id)
+    if kwargs['signal'] is post_delete or previous != instance.project_id:
+        invalidate({instance.project_id, previous})
@@ -0,0 +1,172 @@
+from django.conf import settings
+from django.db.models import Prefetch, Q
+from django.utils.dateparse import parse_date
+from rest_framework import mixins, permissions, viewsets
+from rest_framework.exceptions import NotFound, ValidationError
+
+from . import history
+from .access import visible_project_ids
+from .models import Project, Task, User, WorkLog
+from .serializers import (
+    ProjectSerializer, TaskHistorySerializer, TaskSerializer, WorkLogSerializer,
+    requested_fields,
+)
+
+
+def _int_param(request, name):
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: 'A valid integer is required.'})
+
+
+def _date_param(request, name):
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    try:
+        date = parse_date(value)
+    except ValueError:
+        date = None
+    if date is None:
+        raise ValidationError({name: 'A valid date (YYYY-MM-DD) is required.'})
+    return date
+
+
+class CanEditTask(permissions.BasePermission):
+    # Same rule as the status update views
+    message = 'Permission denied'
+
+    def has_object_permission(self, request, view, obj):
+        if request.method in permissions.SAFE_METHODS:
+            return True
+        return request.user.is_super_admin or obj.assignee_id == request.user.pk
+
+
+class APIViewSet(viewsets.GenericViewSet):
+    def sparse(self, queryset):
+        # Only load the columns a ``?fields=`` request is going to return
+        wanted = requested_fields(self.request)
+        if wanted is None:
+            return queryset
+        columns = {field.name for field in queryset.model._meta.concrete_fields}
+        return queryset.only(*(wanted & columns | {'id', 'created_at'}))
+
+
+class BulkCreateMixin(mixins.CreateModelMixin):
+    # POSTing a JSON list creates all of its objects with bulk inserts
+    def get_serializer(self, *args, **kwargs):
+        if isinstance(kwargs.get('data'), list):
+            kwargs['many'] = True
+            kwargs['max_length'] = settings.API_BULK_MAX_ITEMS
+        return super().get_serializer(*args, **kwargs)
+
+
+class ProjectViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin,
+                     mixins.CreateModelMixin, APIViewSet):
+    serializer_class = ProjectSerializer
+
+    def get_queryset(self):
+        user = self.request.user
+        projects = Project.objects.all()
+        if not user.is_super_admin:
+            projects = projects.filter(pk__in=visible_project_ids(user))
+
+        is_active = self.request.query_params.get('is_active')
+        if is_active in ('true', 'false'):
+            projects = projects.filter(is_active=is_active == 'true')
+
+        wanted = requested_fields(self.request)
+        if wanted is None or 'members' in wanted:
+            projects = projects.prefetch_related(
+                Prefetch('members', queryset=User.objects.only('id'))
+            )
+        return self.sparse(projects)
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+
+
+class TaskViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, BulkCreateMixin,
+                  mixins.UpdateModelMixin, APIViewSet):
+    serializer_class = TaskSerializer
+    permission_classes = [permissions.IsAuthenticated, CanEditTask]
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_super_admin:
+            tasks = Task.objects.all()
+        else:
+            tasks = Task.objects.filter(
+                Q(assignee=user) | Q(project_id__in=visible_project_ids(user))
+            )
+
+        status = self.request.query_params.get('status')
+        if status:
+            tasks = tasks.filter(status=status)
+        project_id = _int_param(self.request, 'project')
+        if project_id:
+            tasks = tasks.filter(project_id=project_id)
+        assignee_id = _int_param(self.request, 'assignee')
+        if assignee_id:
+            tasks = tasks.filter(assignee_id=assignee_id)
+        return self.sparse(tasks)
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+
+
+class WorkLogViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, BulkCreateMixin,
+                     APIViewSet):
+    serializer_class = WorkLogSerializer
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_super_admin:
+            work_logs = WorkLog.objects.all()
+        else:
+            work_logs = WorkLog.objects.filter(user=user)
+
+        date = _date_param(self.request, 'date')
+        if date:
+            work_logs = work_logs.filter(date=date)
+        project_id = _int_param(self.request, 'project')
+        if project_id:
+            work_logs = work_logs.filter(project_id=project_id)
+        task_id = _int_param(self.request, 'task')
+        if task_id:
+            work_logs = work_logs.filter(task_id=task_id)
+        return self.sparse(work_logs)
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+
+class TaskHistoryViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, APIViewSet):
+    serializer_class = TaskHistorySerializer
+
+    def get_queryset(self):
+        # Recent and archived history, paged through as one (see KeysetPagination)
+        user = self.request.user
+        task_id = _int_param(self.request, 'task')
+        project_id = _int_param(self.request, 'project')
+        querysets = []
+        for queryset in history.querysets():
+            if not user.is_super_admin:
+                queryset = queryset.filter(task__project_id__in=visible_project_ids(user))
+            if task_id:
+                queryset = queryset.filter(task_id=task_id)
+            if project_id:
+                queryset = queryset.filter(task__project_id=project_id)
+            querysets.append(self.sparse(queryset))
+        return querysets
+
+    def get_object(self):
+        for queryset in self.get_queryset():
+            obj = queryset.filter(pk=self.kwargs['pk']).first()
+            if obj is not None:
+                return obj
+        raise NotFound
@@ -0,0 +1,10 @@
+from rest_framework.routers import DefaultRouter
+from . import api
+
+router = DefaultRouter()
+router.register('projects', api.ProjectViewSet, basename='api-project')
+router.register('tasks', api.TaskViewSet, basename='api-task')
+router.register('worklogs', api.WorkLogViewSet, basename='api-worklog')
+router.register('task-history', api.TaskHistoryViewSet, basename='api-taskhistory')
+
+urlpatterns = router.urls
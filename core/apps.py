@@ -2,4 +2,9 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'core'
\ No newline at end of file
+    name = 'core'
+
+    def ready(self):
+        # Register system checks and signal receivers
+        from . import checks  # noqa: F401
+        from . import access, analytics, authcache, conditional, counters, dashboard, fragments, rollups, search  # noqa: F401
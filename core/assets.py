@@ -0,0 +1,79 @@
+import gzip
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli for .br copies
+    brotli = None
+
+# Static asset pipeline. build_assets compiles the Tailwind classes used in
+# templates/ (and the widget classes in core/forms.py) into BUNDLE, then
+# collectstatic stores every file under a content-hashed name with gzip and
+# brotli copies next to it. StaticAssetMiddleware serves them.
+
+BUNDLE = 'css/app.css'
+# Compiles the CSS in the browser; only used until a bundle has been built
+PLAY_CDN = 'https://cdn.tailwindcss.com'
+
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json', '.map', '.txt', '.html', '.xml')
+# Smaller files do not shrink enough to be worth a second request path
+MIN_COMPRESS_BYTES = 256
+
+# Accept-Encoding token -> suffix of the precompressed copy, best first
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+
+def _compressors():
+    yield '.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield '.br', lambda data: brotli.compress(data, quality=11)
+
+
+def compress(path):
+    """Write the .gz (and .br) copies of ``path``; return their sizes by suffix."""
+    path = Path(path)
+    data = path.read_bytes()
+    sizes = {}
+    if len(data) < MIN_COMPRESS_BYTES:
+        return sizes
+    for suffix, compressor in _compressors():
+        target = path.with_name(path.name + suffix)
+        if target.exists():
+            # Hashed names: the same name always holds the same content
+            sizes[suffix] = target.stat().st_size
+            continue
+        compressed = compressor(data)
+        if len(compressed) < len(data) * 0.95:
+            target.write_bytes(compressed)
+            sizes[suffix] = len(compressed)
+    return sizes
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Hashed file names plus precompressed copies of the hashed files."""
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            # collectstatic has not run here: keep serving the plain names
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for name in sorted(set(self.hashed_files.values())):
+            if name.endswith(COMPRESSIBLE) and self.exists(name):
+                compress(self.path(name))
+
+
+def bundle_url():
+    """Return the URL of the built CSS bundle, or ``None`` if there is none yet."""
+    hashed_files = getattr(staticfiles_storage, 'hashed_files', {})
+    if BUNDLE in hashed_files or (settings.DEBUG and finders.find(BUNDLE)):
+        return staticfiles_storage.url(BUNDLE)
+    return None
@@ -0,0 +1,82 @@
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.crypto import constant_time_compare
+
+from .models import User
+
+# The user row behind request.user, kept in the default cache for
+# AUTH_USER_CACHE_TIMEOUT seconds so authenticated requests skip the User
+# query. Entries hold every column except the password, plus the session
+# auth hash derived from it; a session whose hash does not match goes through
+# django.contrib.auth.get_user(), which reloads the user and logs out
+# sessions from before a password change. Saving or deleting a user drops the
+# entry. With the default per-process LocMemCache other workers pick up the
+# change when their entry expires.
+
+FIELD_NAMES = [field.attname for field in User._meta.concrete_fields if field.attname != 'password']
+
+
+def _cache_key(user_id):
+    return f'authcache:user:{user_id}'
+
+
+def _from_cache(entry, backend_path):
+    values, session_hash = entry
+    # The password is deferred and only loaded if a view asks for it
+    user = User.from_db(DEFAULT_DB_ALIAS, FIELD_NAMES, values)
+    user.backend = backend_path
+    return user, session_hash
+
+
+def get_user(request):
+    """Return the user of ``request``'s session, from the cache when possible."""
+    try:
+        user_id = User._meta.pk.to_python(request.session[auth.SESSION_KEY])
+        backend_path = request.session[auth.BACKEND_SESSION_KEY]
+    except KeyError:
+        return AnonymousUser()
+    if backend_path not in settings.AUTHENTICATION_BACKENDS:
+        return AnonymousUser()
+
+    entry = cache.get(_cache_key(user_id))
+    if entry is not None:
+        user, session_hash = _from_cache(entry, backend_path)
+        if constant_time_compare(request.session.get(auth.HASH_SESSION_KEY, ''), session_hash):
+            return user
+
+    user = auth.get_user(request)
+    if user.is_authenticated:
+        remember(user)
+    return user
+
+
+def remember(user):
+    cache.set(
+        _cache_key(user.pk),
+        ([getattr(user, name) for name in FIELD_NAMES], user.get_session_auth_hash()),
+        settings.AUTH_USER_CACHE_TIMEOUT,
+    )
+
+
+def invalidate(user_id):
+    key = _cache_key(user_id)
+    cache.delete(key)
+    # Also drop it once the transaction commits, in case a concurrent request
+    # re-cached the old row in between
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, **kwargs):
+    # Password, role and is_active changes all go through save()
+    invalidate(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    invalidate(instance.pk)
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+CACHED_SESSION_ENGINES = (
+    'django.contrib.sessions.backends.cache',
+    'django.contrib.sessions.backends.cached_db',
+)
+
+
+@register(Tags.security, Tags.caches)
+def check_session_cache(app_configs, **kwargs):
+    if settings.SESSION_ENGINE not in CACHED_SESSION_ENGINES:
+        return []
+    backend = settings.CACHES.get(settings.SESSION_CACHE_ALIAS, {}).get('BACKEND', '')
+    if not backend.endswith('.LocMemCache'):
+        return []
+    return [Warning(
+        f'SESSION_ENGINE {settings.SESSION_ENGINE} stores sessions in the per-process '
+        f'LocMemCache ("{settings.SESSION_CACHE_ALIAS}" cache).',
+        hint=(
+            'A logout on one worker is not seen by the others until the cached session '
+            'expires. Point CACHE_BACKEND at a shared cache, or use '
+            'django.contrib.sessions.backends.db.'
+        ),
+        id='core.W001',
+    )]
@@ -0,0 +1,119 @@
+import hashlib
+
+from django.contrib.messages import get_messages
+from django.db.models import Max, Sum
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .access import can_view_project, visible_project_ids
+from .fragments import bump_versions
+from .models import Project, Task, WorkLog
+
+# Version fingerprints (ETags) for the project and task pages.
+#
+# Each fingerprint combines the newest updated_at and the row counts of what
+# the page shows. Counts come from the per-project task counters and the
+# newest timestamps from indexes, so computing one costs a few index lookups
+# instead of a render. Membership changes bump Project.updated_at (see below),
+# which covers the member lists and counts.
+
+COUNTER_SUMS = {
+    'todo': Sum('todo_count'),
+    'in_progress': Sum('in_progress_count'),
+    'done': Sum('done_count'),
+}
+
+
+def _fingerprint(request, *parts):
+    # A 304 would hide queued flash messages behind the cached page
+    if len(get_messages(request)):
+        return None
+    # Pages embed CSRF tokens and per-user markup; a rotated CSRF secret
+    # (e.g. after logging in again) must not revive an old page
+    parts = (
+        request.user.pk,
+        request.META.get('CSRF_COOKIE', ''),
+        request.get_full_path(),
+        *parts,
+    )
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def _newest(queryset, field='updated_at'):
+    return queryset.order_by(f'-{field}').values_list(field, flat=True).first()
+
+
+def project_list_etag(request):
+    projects = Project.objects.filter(is_active=True)
+    if not request.user.is_super_admin:
+        projects = projects.filter(pk__in=visible_project_ids(request.user))
+    rows = projects.order_by('pk').values_list(
+        'pk', 'updated_at', 'todo_count', 'in_progress_count', 'done_count',
+    )
+    return _fingerprint(request, list(rows))
+
+
+def project_detail_etag(request, pk):
+    if not can_view_project(request.user, pk):
+        return None
+    project = Project.objects.filter(pk=pk).values_list(
+        'updated_at', 'todo_count', 'in_progress_count', 'done_count',
+    ).first()
+    if project is None:
+        return None
+    logs = WorkLog.objects.filter(project_id=pk).order_by()
+    return _fingerprint(
+        request,
+        project,
+        _newest(Task.objects.filter(project_id=pk)),
+        logs.count(),
+        _newest(logs),
+    )
+
+
+def task_list_etag(request):
+    user = request.user
+    projects = Project.objects.all()
+    tasks = Task.objects.all()
+    extra = None
+    if not user.is_super_admin:
+        visible = visible_project_ids(user)
+        projects = projects.filter(pk__in=visible)
+        # Tasks assigned to the user in projects they cannot otherwise see
+        assigned_elsewhere = Task.objects.filter(assignee=user).exclude(project_id__in=visible)
+        extra = (assigned_elsewhere.count(), _newest(assigned_elsewhere))
+        tasks = tasks.filter(project_id__in=visible)
+
+    project_id = request.GET.get('project')
+    if project_id:
+        try:
+            projects = projects.filter(pk=int(project_id))
+            tasks = tasks.filter(project_id=int(project_id))
+        except ValueError:
+            return None
+
+    # Row counts come from the counters, names and renames from updated_at
+    state = projects.order_by().aggregate(newest_project=Max('updated_at'), **COUNTER_SUMS)
+    return _fingerprint(request, sorted(state.items()), _newest(tasks), extra)
+
+
+def touch_projects(project_ids):
+    """Bump ``updated_at`` and the version so the fingerprints of these projects change."""
+    bump_versions(project_ids, updated_at=timezone.now())
+
+
+@receiver(m2m_changed, sender=Project.members.through)
+def project_members_touched(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            touch_projects([instance.pk])
+    elif action == 'pre_clear':
+        # Remember which projects the user is about to leave
+        instance._cleared_project_ids = list(
+            sender.objects.filter(user_id=instance.pk).values_list('project_id', flat=True)
+        )
+    elif action == 'post_clear':
+        touch_projects(getattr(instance, '_cleared_project_ids', []))
+    elif action in ('post_add', 'post_remove'):
+        touch_projects(pk_set)
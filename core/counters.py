@@ -0,0 +1,132 @@
+from collections import defaultdict
+
+from django.db.models import Case, Count, F, IntegerField, Value, When
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Project, Task
+from .signals import tasks_bulk_created, tasks_bulk_updated
+
+# Task status -> Project counter field
+COUNTER_FIELDS = {
+    'todo': 'todo_count',
+    'in_progress': 'in_progress_count',
+    'done': 'done_count',
+}
+
+
+def apply_deltas(deltas, touched=()):
+    """Apply ``{(project_id, status): delta}`` to the project counters.
+
+    The version of every project in ``deltas`` or ``touched`` is bumped in
+    the same UPDATE statement (see core.fragments).
+    """
+    per_field = defaultdict(lambda: defaultdict(int))
+    for (project_id, status), delta in deltas.items():
+        field = COUNTER_FIELDS.get(status)
+        if project_id is None or field is None or not delta:
+            continue
+        per_field[field][project_id] += delta
+
+    updates = {}
+    project_ids = {pk for pk in touched if pk is not None}
+    for field, per_project in per_field.items():
+        whens = [When(pk=pk, then=Value(delta)) for pk, delta in per_project.items() if delta]
+        if not whens:
+            continue
+        updates[field] = F(field) + Case(*whens, default=Value(0), output_field=IntegerField())
+        project_ids.update(per_project)
+
+    if project_ids:
+        Project.objects.filter(pk__in=project_ids).update(version=F('version') + 1, **updates)
+
+
+def count_tasks(project_ids=None):
+    """Return ``{project_id: {counter_field: count}}`` computed from the task table."""
+    tasks = Task.objects.all()
+    if project_ids is not None:
+        tasks = tasks.filter(project_id__in=project_ids)
+
+    counts = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS.values(), 0))
+    rows = tasks.order_by().values_list('project_id', 'status').annotate(n=Count('id'))
+    for project_id, status, n in rows:
+        field = COUNTER_FIELDS.get(status)
+        if field:
+            counts[project_id][field] = n
+    return counts
+
+
+def rebuild_counters(project_ids=None, fix=True, batch_size=500):
+    """Compare stored counters with the task table.
+
+    Returns a list of ``(project, stored, expected)`` tuples for every project
+    whose counters are wrong. When ``fix`` is true those projects are corrected.
+    """
+    counts = count_tasks(project_ids)
+    projects = Project.objects.only('id', 'name', *COUNTER_FIELDS.values())
+    if project_ids is not None:
+        projects = projects.filter(pk__in=project_ids)
+
+    mismatches = []
+    zero = dict.fromkeys(COUNTER_FIELDS.values(), 0)
+    for project in projects.order_by('pk').iterator(chunk_size=batch_size):
+        expected = counts.get(project.pk, zero)
+        stored = {field: getattr(project, field) for field in expected}
+        if stored != expected:
+            mismatches.append((project, stored, expected))
+
+    if fix and mismatches:
+        for project, _, expected in mismatches:
+            for field, value in expected.items():
+                setattr(project, field, value)
+            project.version = F('version') + 1
+        Project.objects.bulk_update(
+            [project for project, _, _ in mismatches],
+            [*COUNTER_FIELDS.values(), 'version'],
+            batch_size=batch_size,
+        )
+    return mismatches
+
+
+def _counter_key(values):
+    return values.get('project_id'), values.get('status')
+
+
+@receiver(post_save, sender=Task)
+def update_counters_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    new_key = (instance.project_id, instance.status)
+    old_key = None if created else _counter_key(getattr(instance, '_loaded_values', {}))
+    deltas = defaultdict(int)
+    if old_key != new_key:
+        deltas[new_key] += 1
+        if old_key is not None:
+            deltas[old_key] -= 1
+    # Other edits only bump the project version
+    apply_deltas(deltas, touched=[instance.project_id])
+
+
+@receiver(post_delete, sender=Task)
+def update_counters_on_delete(sender, instance, **kwargs):
+    old_key = _counter_key(getattr(instance, '_loaded_values', {}))
+    if old_key[0] is None:
+        old_key = (instance.project_id, instance.status)
+    apply_deltas({old_key: -1})
+
+
+@receiver(tasks_bulk_created)
+def update_counters_on_bulk_create(sender, tasks, **kwargs):
+    deltas = defaultdict(int)
+    for task in tasks:
+        deltas[(task.project_id, task.status)] += 1
+    apply_deltas(deltas)
+
+
+@receiver(tasks_bulk_updated)
+def update_counters_on_bulk_update(sender, tasks, previous, **kwargs):
+    deltas = defaultdict(int)
+    for task in tasks:
+        deltas[(task.project_id, task.status)] += 1
+        deltas[_counter_key(previous.get(task.pk, {}))] -= 1
+    apply_deltas(deltas, touched={task.project_id for task in tasks})
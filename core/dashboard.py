@@ -0,0 +1,145 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .access import users_for_projects, visible_project_ids
+from .models import OverdueDigest, Project, Task, WorkLog
+from .signals import tasks_bulk_created, tasks_bulk_updated, worklogs_bulk_created
+
+ADMIN_GENERATION_KEY = 'dashboard:admin-generation'
+
+
+def _cache_key(user, today):
+    if user.is_super_admin:
+        # Super admins see everything, so every change invalidates them at once
+        generation = cache.get_or_set(ADMIN_GENERATION_KEY, 0, None)
+        return f'dashboard:admin:{generation}:{user.pk}:{today.isoformat()}'
+    return f'dashboard:user:{user.pk}:{today.isoformat()}'
+
+
+def build_snapshot(user, today):
+    if user.is_super_admin:
+        projects = Project.objects.filter(is_active=True)
+        tasks = Task.objects.all()
+        work_logs = WorkLog.objects.all()
+    else:
+        project_ids = visible_project_ids(user)
+        projects = Project.objects.filter(pk__in=project_ids, is_active=True)
+        tasks = Task.objects.filter(
+            Q(assignee=user) | Q(project_id__in=project_ids)
+        )
+        work_logs = WorkLog.objects.filter(user=user)
+
+    # All task statistics in a single conditional-aggregation pass
+    task_stats = tasks.aggregate(
+        total=Count('pk'),
+        todo=Count('pk', filter=Q(status='todo')),
+        in_progress=Count('pk', filter=Q(status='in_progress')),
+        done=Count('pk', filter=Q(status='done')),
+    )
+
+    return {
+        'projects': list(projects[:5]),
+        'recent_tasks': list(
+            tasks.select_related('project', 'assignee').order_by('-updated_at')[:5]
+        ),
+        'today_logs': list(work_logs.filter(date=today).select_related('project', 'task')),
+        'task_stats': task_stats,
+        # Flags and digests are precomputed (see core.overdue)
+        'overdue_tasks': list(tasks.filter(overdue=True).order_by(*Task.URGENCY_ORDERING)[:5]),
+        'overdue_digest': OverdueDigest.objects.filter(user=user).first(),
+        'total_projects': projects.count(),
+    }
+
+
+def get_snapshot(user):
+    """Return the dashboard context for ``user``, from the cache when possible."""
+    today = timezone.now().date()
+    key = _cache_key(user, today)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_snapshot(user, today)
+        cache.set(key, snapshot, settings.DASHBOARD_CACHE_TIMEOUT)
+    return snapshot
+
+
+def invalidate(user_ids):
+    """Drop the cached dashboards of ``user_ids`` and of every super admin."""
+    user_ids = {pk for pk in user_ids if pk is not None}
+    today = timezone.now().date().isoformat()
+
+    def _invalidate():
+        cache.delete_many([f'dashboard:user:{pk}:{today}' for pk in user_ids])
+        try:
+            cache.incr(ADMIN_GENERATION_KEY)
+        except ValueError:
+            cache.set(ADMIN_GENERATION_KEY, 1, None)
+
+    # Invalidate after commit so a concurrent request cannot re-cache stale data
+    transaction.on_commit(_invalidate)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def task_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # _loaded_values still holds the state from before this save
+    previous = getattr(instance, '_loaded_values', {})
+    project_ids = {instance.project_id, previous.get('project_id')}
+    user_ids = users_for_projects(project_ids)
+    user_ids.update({instance.assignee_id, previous.get('assignee_id')})
+    invalidate(user_ids)
+
+
+@receiver(tasks_bulk_created)
+@receiver(tasks_bulk_updated)
+def tasks_bulk_changed(sender, tasks, previous=None, **kwargs):
+    previous = previous or {}
+    project_ids = set()
+    user_ids = set()
+    for task in tasks:
+        old = previous.get(task.pk, {})
+        project_ids.update({task.project_id, old.get('project_id')})
+        user_ids.update({task.assignee_id, old.get('assignee_id')})
+    invalidate(user_ids | users_for_projects(project_ids))
+
+
+@receiver(post_save, sender=WorkLog)
+@receiver(post_delete, sender=WorkLog)
+def worklog_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    invalidate({instance.user_id})
+
+
+@receiver(worklogs_bulk_created)
+def worklogs_bulk_changed(sender, work_logs, **kwargs):
+    invalidate({work_log.user_id for work_log in work_logs})
+
+
+@receiver(post_save, sender=Project)
+@receiver(pre_delete, sender=Project)
+def project_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    invalidate(users_for_projects({instance.pk}))
+
+
+@receiver(m2m_changed, sender=Project.members.through)
+def project_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # user.assigned_projects.add(...): only that user's view changes
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            invalidate({instance.pk})
+    elif action == 'pre_clear':
+        # The cleared rows are gone by post_clear, so collect them now
+        instance._cleared_member_ids = set(instance.members.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        invalidate(getattr(instance, '_cleared_member_ids', set()))
+    elif action in ('post_add', 'post_remove'):
+        invalidate(pk_set or set())
@@ -0,0 +1,70 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+REPORTING_DB = 'reporting'
+
+_reporting = ContextVar('reporting', default=False)
+
+
+def reporting_enabled():
+    return REPORTING_DB in settings.DATABASES
+
+
+@contextmanager
+def use_reporting():
+    """Send ORM reads made inside the block to the read-only reporting connection."""
+    token = _reporting.set(True)
+    try:
+        yield
+    finally:
+        _reporting.reset(token)
+
+
+def _stream_in_reporting(content):
+    # Streaming bodies are generated after the view returns; route each chunk
+    iterator = iter(content)
+    while True:
+        with use_reporting():
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+        yield chunk
+
+
+def reporting_view(view):
+    """Decorator for read-only views that may be served from the reporting connection."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        with use_reporting():
+            response = view(request, *args, **kwargs)
+        if response.streaming:
+            response.streaming_content = _stream_in_reporting(response.streaming_content)
+        return response
+    return wrapper
+
+
+class ReportingRouter:
+    """Route reads inside ``use_reporting()`` to the read-only "reporting" database.
+
+    Without the tuned SQLite profile there is no reporting alias and every
+    query stays on "default".
+    """
+
+    def db_for_read(self, model, **hints):
+        if _reporting.get() and reporting_enabled():
+            return REPORTING_DB
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases point at the same database file
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPORTING_DB
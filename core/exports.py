@@ -0,0 +1,113 @@
+import csv
+import heapq
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import TaskHistory, WorkLog
+
+# (column name, values_list lookup); the primary key must come first
+WORKLOG_COLUMNS = [
+    ('id', 'id'),
+    ('date', 'date'),
+    ('user', 'user__username'),
+    ('project_id', 'project_id'),
+    ('project', 'project__name'),
+    ('task_id', 'task_id'),
+    ('task', 'task__title'),
+    ('hours_spent', 'hours_spent'),
+    ('description', 'description'),
+    ('created_at', 'created_at'),
+]
+
+HISTORY_COLUMNS = [
+    ('id', 'id'),
+    ('created_at', 'created_at'),
+    ('project_id', 'task__project_id'),
+    ('project', 'task__project__name'),
+    ('task_id', 'task_id'),
+    ('task', 'task__title'),
+    ('user', 'user__username'),
+    ('action', 'action'),
+    ('old_value', 'old_value'),
+    ('new_value', 'new_value'),
+    ('description', 'description'),
+]
+
+FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def worklog_queryset(start=None, end=None, project_id=None):
+    work_logs = WorkLog.objects.all()
+    if start:
+        work_logs = work_logs.filter(date__gte=start)
+    if end:
+        work_logs = work_logs.filter(date__lte=end)
+    if project_id:
+        work_logs = work_logs.filter(project_id=project_id)
+    return work_logs
+
+
+def history_queryset(start=None, end=None, project_id=None, model=TaskHistory):
+    history = model.objects.all()
+    if start:
+        history = history.filter(created_at__date__gte=start)
+    if end:
+        history = history.filter(created_at__date__lte=end)
+    if project_id:
+        history = history.filter(task__project_id=project_id)
+    return history
+
+
+def iter_rows(queryset, columns, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield ``values_list`` rows of ``queryset`` in primary key order.
+
+    Rows are fetched in chunks with ``pk > last seen pk`` so that every
+    chunk is an indexed range scan and only one chunk is held in memory.
+    """
+    lookups = [lookup for _, lookup in columns]
+    queryset = queryset.order_by('pk').values_list(*lookups)
+    last_pk = None
+    while True:
+        chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(chunk[:chunk_size])
+        if not rows:
+            return
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        last_pk = rows[-1][0]
+
+
+def iter_merged_rows(querysets, columns, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield the rows of several querysets sharing one primary key space, in pk order."""
+    return heapq.merge(
+        *(iter_rows(queryset, columns, chunk_size) for queryset in querysets),
+        key=lambda row: row[0],
+    )
+
+
+class _Echo:
+    # File-like object whose write() returns the line for csv.writer
+    def write(self, value):
+        return value
+
+
+def render(rows, columns, fmt):
+    """Encode ``rows`` as CSV or NDJSON, one line at a time."""
+    header = [name for name, _ in columns]
+    if fmt == 'csv':
+        writer = csv.writer(_Echo())
+        yield writer.writerow(header)
+        for row in rows:
+            yield writer.writerow(row)
+    elif fmt == 'ndjson':
+        for row in rows:
+            yield json.dumps(dict(zip(header, row)), cls=DjangoJSONEncoder) + '\n'
+    else:
+        raise ValueError(f'Unknown export format: {fmt}')
@@ -1,8 +1,9 @@
 from django import forms
 from django.utils import timezone
 from django.contrib.auth.forms import UserCreationForm
-from django.db.models import Q   # clean import for queries
 
+from .access import visible_project_ids
+from .imports import KIND_CHOICES
 from .models import User, Project, Task, WorkLog
 
 
@@ -103,9 +104,43 @@ class WorkLogForm(forms.ModelForm):
         if user:
             # Filter projects to only those the user is a member of or created
             self.fields['project'].queryset = Project.objects.filter(
-                Q(members=user) | Q(created_by=user)
-            ).distinct()
+                pk__in=visible_project_ids(user)
+            )
+
+        # Only offer the tasks of the chosen project; the template fetches
+        # them from the project tasks endpoint when the project changes
+        project_id = self._selected_project_id()
+        if project_id is not None and (user is None or project_id in visible_project_ids(user)):
+            tasks = Task.objects.filter(project_id=project_id).only('id', 'title').order_by('title', 'id')
+        else:
+            tasks = Task.objects.none()
+        self.fields['task'].queryset = tasks
+        self.fields['task'].label_from_instance = lambda task: task.title
 
         # Set default date to today
         if not self.instance.pk:
             self.fields['date'].initial = timezone.now().date()
+
+    def _selected_project_id(self):
+        if self.is_bound:
+            value = self.data.get(self.add_prefix('project'))
+        else:
+            value = self.initial.get('project') or self.instance.project_id
+            value = getattr(value, 'pk', value)
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+
+class ImportForm(forms.Form):
+    kind = forms.ChoiceField(choices=KIND_CHOICES, widget=forms.Select(attrs={
+        'class': 'w-full px-3 py-2 border border-gray-300 rounded-md '
+                 'focus:outline-none focus:ring-2 focus:ring-blue-500'}))
+    file = forms.FileField(widget=forms.ClearableFileInput(attrs={'accept': '.csv,text/csv'}))
+    atomic = forms.BooleanField(
+        required=False, label='All or nothing',
+        help_text='Import nothing if any row is rejected.')
+    dry_run = forms.BooleanField(
+        required=False, label='Validate only',
+        help_text='Check every row without importing anything.')
@@ -0,0 +1,76 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .metrics import registry
+from .models import Project, WorkLog
+from .signals import worklogs_bulk_created
+
+# Rendered template fragments are cached under the project's version, so a
+# change anywhere in the project makes every old fragment unreachable instead
+# of deleting it; unused entries age out of the (LRU, size-bounded) cache.
+#
+# Task changes bump the version together with the task counters
+# (core.counters), membership changes through core.conditional.touch_projects,
+# and work log changes below.
+
+CACHE_ALIAS = 'fragments'
+
+
+def bump_versions(project_ids, **updates):
+    project_ids = {pk for pk in project_ids if pk is not None}
+    if project_ids:
+        Project.objects.filter(pk__in=project_ids).update(version=F('version') + 1, **updates)
+
+
+def fragment_key(name, project, vary=()):
+    key = f'fragment:{name}:{project.pk}:{project.version}:{project.updated_at.timestamp()}'
+    if vary:
+        key += ':' + hashlib.md5(repr(vary).encode()).hexdigest()
+    return key
+
+
+def _record(name, result):
+    registry.inc('fragment_cache_requests_total', {'fragment': name, 'result': result},
+                 help_text='Template fragment cache lookups by result.')
+
+
+def get_or_render(name, project, render, vary=()):
+    """Return the cached fragment ``name`` of ``project``, rendering it on a miss."""
+    cache = caches[CACHE_ALIAS]
+    key = fragment_key(name, project, vary)
+    content = cache.get(key)
+    if content is not None:
+        _record(name, 'hit')
+        return content
+
+    content = render()
+    # Huge boards would push many small fragments out of the cache
+    if len(content) <= settings.FRAGMENT_CACHE_MAX_BYTES:
+        cache.set(key, content)
+        _record(name, 'miss')
+    else:
+        _record(name, 'too_large')
+    return content
+
+
+def _worklog_project_ids(instance):
+    previous = getattr(instance, '_loaded_values', {})
+    return {instance.project_id, previous.get('project_id')}
+
+
+@receiver(post_save, sender=WorkLog)
+@receiver(post_delete, sender=WorkLog)
+def worklog_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    bump_versions(_worklog_project_ids(instance))
+
+
+@receiver(worklogs_bulk_created)
+def worklogs_bulk_changed(sender, work_logs, **kwargs):
+    bump_versions({work_log.project_id for work_log in work_logs})
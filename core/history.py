@@ -0,0 +1,41 @@
+from django.db import transaction
+
+from .models import ArchivedTaskHistory, TaskHistory
+
+# Task history lives in two stores with the same columns and ids: recent rows
+# in TaskHistory, rows older than TASK_HISTORY_RETENTION_DAYS in
+# ArchivedTaskHistory. Read paths query both (see exports.iter_merged_rows
+# and pagination.keyset_paginate_many) so a task's full history stays visible
+# while the table that takes every write stays small.
+
+STORES = (TaskHistory, ArchivedTaskHistory)
+
+ARCHIVED_FIELDS = [
+    'id', 'task_id', 'user_id', 'action', 'old_value', 'new_value', 'description', 'created_at',
+]
+
+
+def querysets():
+    return [model.objects.all() for model in STORES]
+
+
+def archive_batch(cutoff, batch_size):
+    """Move up to ``batch_size`` history rows created before ``cutoff`` to the archive.
+
+    Each batch is copied and deleted in one transaction, so an interrupted run
+    loses nothing and the next run carries on where it stopped. Returns the
+    number of rows moved.
+    """
+    with transaction.atomic():
+        rows = list(
+            TaskHistory.objects.filter(created_at__lt=cutoff)
+            .order_by('created_at')
+            .values(*ARCHIVED_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return 0
+        ArchivedTaskHistory.objects.bulk_create(
+            [ArchivedTaskHistory(**row) for row in rows], ignore_conflicts=True,
+        )
+        TaskHistory.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+    return len(rows)
@@ -0,0 +1,328 @@
+import csv
+from contextlib import nullcontext
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import Project, Task, User, WorkLog
+from .services import create_tasks, create_work_logs
+
+# Bulk import of tasks and work logs from CSV.
+#
+# Rows are read in batches. Each batch resolves its project, user and task
+# references with a few bulk lookups, validates every row, then inserts the
+# valid ones with bulk INSERTs in one transaction, so a bad row is reported
+# and skipped without costing the rest of the file.
+
+# Reference columns hold an id or a name (project) / username (user); an exact
+# name match wins over an id.
+TASK_COLUMNS = ('title', 'description', 'project', 'assignee', 'status', 'priority', 'due_date')
+TASK_REQUIRED = ('title', 'project', 'assignee')
+WORKLOG_COLUMNS = ('user', 'project', 'task', 'description', 'hours_spent', 'date')
+WORKLOG_REQUIRED = ('project', 'description', 'hours_spent')
+
+KIND_CHOICES = [
+    ('tasks', 'Tasks'),
+    ('worklogs', 'Work logs'),
+]
+
+VALID_STATUSES = dict(Task.STATUS_CHOICES)
+VALID_PRIORITIES = dict(Task.PRIORITY_CHOICES)
+TITLE_MAX_LENGTH = Task._meta.get_field('title').max_length
+# hours_spent is DecimalField(max_digits=5, decimal_places=2)
+MAX_HOURS = Decimal('999.99')
+
+AMBIGUOUS = object()
+
+
+class ImportFileError(Exception):
+    """The file cannot be imported at all (no header, missing columns)."""
+
+
+class ImportResult:
+    def __init__(self, kind, dry_run=False, atomic=False):
+        self.kind = kind
+        self.dry_run = dry_run
+        self.atomic = atomic
+        self.rows = 0
+        self.valid = 0
+        self.created = 0
+        # (line number, message) per rejected row
+        self.errors = []
+        self.stopped = False
+
+    @property
+    def rolled_back(self):
+        return self.atomic and bool(self.errors) and not self.dry_run
+
+
+def _value(row, name):
+    return (row.get(name) or '').strip()
+
+
+class References:
+    # Projects and users repeat on almost every row: each key is looked up once
+    # per import. Tasks are looked up per batch.
+    def __init__(self):
+        self.projects = {}
+        self.users = {}
+
+    def _load(self, cache, keys, queryset, name_field):
+        keys = {key for key in keys if key and key not in cache}
+        if not keys:
+            return
+        ids = {int(key) for key in keys if key.isdigit()}
+        by_name = {}
+        by_id = {}
+        for pk, name in queryset.filter(
+            Q(**{f'{name_field}__in': keys}) | Q(pk__in=ids)
+        ).values_list('pk', name_field):
+            by_id[str(pk)] = pk
+            by_name[name] = AMBIGUOUS if name in by_name else pk
+        for key in keys:
+            cache[key] = by_name.get(key, by_id.get(key))
+
+    def load_projects(self, keys):
+        self._load(self.projects, keys, Project.objects.all(), 'name')
+
+    def load_users(self, keys):
+        self._load(self.users, keys, User.objects.all(), 'username')
+
+    def project(self, key, errors):
+        return self._resolve(self.projects, key, 'project', errors)
+
+    def user(self, key, column, errors):
+        return self._resolve(self.users, key, column, errors)
+
+    def _resolve(self, cache, key, column, errors):
+        if not key:
+            return None
+        pk = cache.get(key)
+        if pk is AMBIGUOUS:
+            errors.append(f'{column}: "{key}" matches several rows, use the id')
+            return None
+        if pk is None:
+            errors.append(f'{column}: "{key}" not found')
+        return pk
+
+
+def _batches(reader, size):
+    # (line number, row) pairs, ``size`` at a time
+    def numbered():
+        for row in reader:
+            yield reader.line_num, row
+
+    rows = numbered()
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _date(row, name, errors, default=None):
+    value = _value(row, name)
+    if not value:
+        return default
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        errors.append(f'{name}: "{value}" is not a valid date (YYYY-MM-DD)')
+    return parsed
+
+
+def _required(row, name, errors):
+    value = _value(row, name)
+    if not value:
+        errors.append(f'{name}: this field is required')
+    return value
+
+
+class TaskImporter:
+    columns = TASK_COLUMNS
+    required = TASK_REQUIRED
+
+    def __init__(self, user, references):
+        self.user = user
+        self.references = references
+
+    def build(self, batch, result):
+        self.references.load_projects(_value(row, 'project') for _, row in batch)
+        self.references.load_users(_value(row, 'assignee') for _, row in batch)
+        tasks = []
+        for line, row in batch:
+            errors = []
+            title = _required(row, 'title', errors)
+            if len(title) > TITLE_MAX_LENGTH:
+                errors.append(f'title: longer than {TITLE_MAX_LENGTH} characters')
+            project_id = self.references.project(_required(row, 'project', errors), errors)
+            assignee_id = self.references.user(_required(row, 'assignee', errors), 'assignee', errors)
+            status = _value(row, 'status') or 'todo'
+            if status not in VALID_STATUSES:
+                errors.append(f'status: "{status}" is not one of {", ".join(VALID_STATUSES)}')
+            priority = _value(row, 'priority') or 'medium'
+            if priority not in VALID_PRIORITIES:
+                errors.append(f'priority: "{priority}" is not one of {", ".join(VALID_PRIORITIES)}')
+            due_date = _date(row, 'due_date', errors)
+            if errors:
+                result.errors.append((line, '; '.join(errors)))
+                continue
+            tasks.append(Task(
+                title=title,
+                description=_value(row, 'description'),
+                project_id=project_id,
+                assignee_id=assignee_id,
+                created_by=self.user,
+                status=status,
+                priority=priority,
+                due_date=due_date,
+            ))
+        return tasks
+
+    def insert(self, tasks):
+        create_tasks(tasks)
+
+
+class WorkLogImporter:
+    columns = WORKLOG_COLUMNS
+    required = WORKLOG_REQUIRED
+
+    def __init__(self, user, references):
+        self.user = user
+        self.references = references
+
+    def _load_tasks(self, batch):
+        # Task references are ids, or titles within the row's project
+        ids = set()
+        titles = set()
+        project_ids = set()
+        for _, row in batch:
+            key = _value(row, 'task')
+            if key.isdigit():
+                ids.add(int(key))
+            elif key:
+                titles.add(key)
+                project_ids.add(self.references.projects.get(_value(row, 'project')))
+        by_id = {}
+        by_title = {}
+        if not ids and not titles:
+            return by_id, by_title
+        project_ids = {pk for pk in project_ids if isinstance(pk, int)}
+        for pk, project_id, title in Task.objects.filter(
+            Q(pk__in=ids) | Q(project_id__in=project_ids, title__in=titles)
+        ).values_list('pk', 'project_id', 'title'):
+            by_id[pk] = project_id
+            key = (project_id, title)
+            by_title[key] = AMBIGUOUS if key in by_title else pk
+        return by_id, by_title
+
+    def _task(self, key, project_id, tasks, errors):
+        by_id, by_title = tasks
+        if not key or project_id is None:
+            return None
+        if key.isdigit():
+            if int(key) not in by_id:
+                errors.append(f'task: "{key}" not found')
+            elif by_id[int(key)] != project_id:
+                errors.append('task: does not belong to the project')
+            return int(key)
+        pk = by_title.get((project_id, key))
+        if pk is AMBIGUOUS:
+            errors.append(f'task: "{key}" matches several tasks in the project, use the id')
+        elif pk is None:
+            errors.append(f'task: "{key}" not found in the project')
+        return pk
+
+    def build(self, batch, result):
+        self.references.load_projects(_value(row, 'project') for _, row in batch)
+        self.references.load_users(_value(row, 'user') for _, row in batch)
+        tasks = self._load_tasks(batch)
+        today = timezone.now().date()
+        work_logs = []
+        for line, row in batch:
+            errors = []
+            user_key = _value(row, 'user')
+            user_id = self.references.user(user_key, 'user', errors) if user_key else self.user.pk
+            project_id = self.references.project(_required(row, 'project', errors), errors)
+            task_id = self._task(_value(row, 'task'), project_id, tasks, errors)
+            description = _required(row, 'description', errors)
+            hours = _required(row, 'hours_spent', errors)
+            if hours:
+                try:
+                    hours = Decimal(hours)
+                except InvalidOperation:
+                    hours = None
+                if hours is None or not hours.is_finite() or not 0 <= hours <= MAX_HOURS \
+                        or hours != round(hours, 2):
+                    errors.append(f'hours_spent: "{_value(row, "hours_spent")}" is not a number '
+                                  f'between 0 and {MAX_HOURS} with at most 2 decimals')
+            work_date = _date(row, 'date', errors, default=today)
+            if errors:
+                result.errors.append((line, '; '.join(errors)))
+                continue
+            work_logs.append(WorkLog(
+                user_id=user_id,
+                project_id=project_id,
+                task_id=task_id,
+                description=description,
+                hours_spent=hours,
+                date=work_date,
+            ))
+        return work_logs
+
+    def insert(self, work_logs):
+        create_work_logs(work_logs)
+
+
+IMPORTERS = {
+    'tasks': TaskImporter,
+    'worklogs': WorkLogImporter,
+}
+
+
+def import_csv(kind, file, user, batch_size=2000, dry_run=False, atomic=False):
+    """Import the rows of the CSV text stream ``file`` as ``kind`` objects.
+
+    ``user`` creates the tasks and owns work logs without a user column. Each
+    batch of ``batch_size`` rows commits on its own unless ``atomic`` is set,
+    in which case the whole file is rolled back if any row is rejected.
+    ``dry_run`` only validates.
+    """
+    importer = IMPORTERS[kind](user, References())
+    reader = csv.DictReader(file)
+    try:
+        header = reader.fieldnames
+    except (csv.Error, UnicodeDecodeError) as exc:
+        raise ImportFileError(f'Unreadable file: {exc}')
+    if not header:
+        raise ImportFileError('The file is empty')
+    reader.fieldnames = [name.strip().lower() for name in header]
+    missing = [name for name in importer.required if name not in reader.fieldnames]
+    if missing:
+        raise ImportFileError(f'Missing columns: {", ".join(missing)}')
+
+    result = ImportResult(kind, dry_run=dry_run, atomic=atomic)
+    with transaction.atomic() if atomic else nullcontext():
+        try:
+            for batch in _batches(reader, batch_size):
+                result.rows += len(batch)
+                objects = importer.build(batch, result)
+                result.valid += len(objects)
+                # Under atomic, keep validating but stop writing after the first error
+                if objects and not dry_run and not (atomic and result.errors):
+                    importer.insert(objects)
+                    result.created += len(objects)
+        except (csv.Error, UnicodeDecodeError) as exc:
+            result.errors.append((reader.line_num, f'Unreadable row, import stopped: {exc}'))
+            result.stopped = True
+        if result.rolled_back:
+            transaction.set_rollback(True)
+            result.created = 0
+    return result
+
@@ -0,0 +1,67 @@
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.utils.functional import cached_property
+
+from .counters import COUNTER_FIELDS
+from .models import Task
+from .pagination import KEYSET_ORDERING, encode_cursor
+
+# Fields shown on a kanban card
+CARD_FIELDS = ('id', 'project_id', 'title', 'description', 'status', 'priority', 'due_date', 'created_at')
+
+
+def card_queryset(project_id):
+    return Task.objects.filter(project_id=project_id).only(*CARD_FIELDS)
+
+
+class Column:
+    def __init__(self, board, status, label):
+        self.board = board
+        self.status = status
+        self.label = label
+
+    @property
+    def count(self):
+        return getattr(self.board.project, COUNTER_FIELDS[self.status])
+
+    @property
+    def tasks(self):
+        return self.board.cards[self.status][:self.board.per_column]
+
+    @property
+    def next_cursor(self):
+        cards = self.board.cards[self.status]
+        if len(cards) > self.board.per_column:
+            return encode_cursor(cards[self.board.per_column - 1])
+        return None
+
+
+class Board:
+    """The first ``per_column`` cards of every status column of a project.
+
+    Nothing is queried until a column's cards are used, so a board whose
+    columns are served from the fragment cache costs no task query at all.
+    Column counts come from the project's task counters.
+    """
+
+    def __init__(self, project, per_column):
+        self.project = project
+        self.per_column = per_column
+        self.columns = [Column(self, status, label) for status, label in Task.STATUS_CHOICES]
+
+    @cached_property
+    def cards(self):
+        # One query: number the tasks within each status in keyset order and
+        # keep one extra row per column to know whether more pages follow
+        ranked = card_queryset(self.project.pk).annotate(
+            position=Window(
+                RowNumber(),
+                partition_by=[F('status')],
+                order_by=list(KEYSET_ORDERING),
+            )
+        ).filter(position__lte=self.per_column + 1).order_by('status', *KEYSET_ORDERING)
+
+        cards = {status: [] for status, _ in Task.STATUS_CHOICES}
+        for task in ranked:
+            cards.setdefault(task.status, []).append(task)
+        return cards
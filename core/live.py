@@ -0,0 +1,224 @@
+import asyncio
+import json
+from weakref import WeakKeyDictionary
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.template.loader import render_to_string
+
+from .access import visible_project_ids
+from .counters import COUNTER_FIELDS
+from .models import TaskHistory
+
+# Live change feed for open boards.
+#
+# TaskHistory ids are the cursor: every status change, assignment and new task
+# writes a history row, and ids only grow. One poller per event loop reads the
+# rows added since its last poll and hands each batch to every subscriber, so
+# the database is polled once per interval however many boards are open.
+# Subscribers drop the events of projects they cannot see.
+
+# Batches a subscriber may fall behind before it is told to reload
+QUEUE_SIZE = 100
+
+
+def latest_id():
+    return TaskHistory.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def fetch_events(after, limit, project_ids=None, until=None):
+    """Return up to ``limit`` events for the history rows after id ``after``."""
+    history = TaskHistory.objects.filter(id__gt=after).select_related('task__project', 'user')
+    if until is not None:
+        history = history.filter(id__lte=until)
+    if project_ids is not None:
+        history = history.filter(task__project_id__in=project_ids)
+    return [_event(row) for row in history.order_by('id')[:limit]]
+
+
+def _event(row):
+    task = row.task
+    project = task.project
+    return {
+        'id': row.pk,
+        'action': row.action,
+        'project': project.pk,
+        'task': task.pk,
+        'status': task.status,
+        'old_value': row.old_value,
+        'new_value': row.new_value,
+        'description': row.description,
+        'user': row.user.username,
+        'created_at': row.created_at.isoformat(),
+        'counts': {status: getattr(project, field) for status, field in COUNTER_FIELDS.items()},
+        'card': render_to_string('core/partials/task_card.html', {'task': task}),
+    }
+
+
+def event_scope(user, project_id=None, refresh=False):
+    """Return the project ids whose events ``user`` receives, or ``None`` for all."""
+    if refresh:
+        # Pick up membership changes made since the stream started
+        user.__dict__.pop('_visible_project_ids', None)
+    if user.is_super_admin:
+        return None if project_id is None else {project_id}
+    visible = visible_project_ids(user)
+    if project_id is None:
+        return visible
+    return {project_id} & visible
+
+
+def _in_scope(event, scope):
+    return scope is None or event['project'] in scope
+
+
+class Subscription:
+    def __init__(self):
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.lagging = False
+
+
+class ChangeFeed:
+    def __init__(self):
+        self.subscribers = set()
+        self.cursor = None
+        self.poller = None
+
+    async def subscribe(self):
+        if self.cursor is None:
+            self.cursor = await sync_to_async(latest_id)()
+        subscription = Subscription()
+        self.subscribers.add(subscription)
+        if self.poller is None or self.poller.done():
+            self.poller = asyncio.create_task(self._poll())
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self.subscribers.discard(subscription)
+
+    async def _poll(self):
+        try:
+            while self.subscribers:
+                await asyncio.sleep(settings.LIVE_POLL_INTERVAL)
+                events = await sync_to_async(fetch_events)(self.cursor, settings.LIVE_BACKLOG_LIMIT)
+                if not events:
+                    continue
+                self.cursor = events[-1]['id']
+                for subscription in list(self.subscribers):
+                    try:
+                        subscription.queue.put_nowait(events)
+                    except asyncio.QueueFull:
+                        subscription.lagging = True
+                        self.subscribers.discard(subscription)
+        finally:
+            # Start from the newest row again once someone subscribes
+            self.poller = None
+            self.cursor = None
+
+
+_feeds = WeakKeyDictionary()
+
+
+def get_feed():
+    # One feed per event loop; under WSGI each request runs its own loop
+    loop = asyncio.get_running_loop()
+    feed = _feeds.get(loop)
+    if feed is None:
+        feed = _feeds[loop] = ChangeFeed()
+    return feed
+
+
+async def _backlog(after, scope, until=None):
+    # Rows a reconnecting client missed, up to where the feed takes over
+    events = await sync_to_async(fetch_events)(
+        after, settings.LIVE_BACKLOG_LIMIT + 1, scope, until=until,
+    )
+    if len(events) > settings.LIVE_BACKLOG_LIMIT:
+        return None
+    return events
+
+
+def _sse(event_type, data, event_id=None):
+    message = f'event: {event_type}\ndata: {json.dumps(data)}\n\n'
+    if event_id is not None:
+        message = f'id: {event_id}\n' + message
+    return message
+
+
+async def stream(user, project_id=None, after=None):
+    """Yield Server-Sent Events for the changes ``user`` may see."""
+    feed = get_feed()
+    subscription = await feed.subscribe()
+    try:
+        scope = await sync_to_async(event_scope)(user, project_id)
+        yield f'retry: {int(settings.LIVE_POLL_INTERVAL * 1000) + 1000}\n\n'
+
+        if after is None:
+            after = feed.cursor
+        else:
+            backlog = await _backlog(after, scope, until=feed.cursor)
+            if backlog is None:
+                yield _sse('reset', {})
+                return
+            for event in backlog:
+                yield _sse('task', event, event['id'])
+                after = event['id']
+
+        while True:
+            try:
+                events = await asyncio.wait_for(
+                    subscription.queue.get(), timeout=settings.LIVE_HEARTBEAT_SECONDS,
+                )
+            except asyncio.TimeoutError:
+                if subscription.lagging:
+                    yield _sse('reset', {})
+                    return
+                scope = await sync_to_async(event_scope)(user, project_id, refresh=True)
+                yield ': keep-alive\n\n'
+                continue
+            for event in events:
+                if event['id'] > after and _in_scope(event, scope):
+                    yield _sse('task', event, event['id'])
+                    after = event['id']
+    finally:
+        feed.unsubscribe(subscription)
+
+
+async def wait_for_events(user, project_id, after, timeout):
+    """Return ``(events, cursor)`` after ``after``, waiting up to ``timeout`` seconds.
+
+    ``events`` is ``None`` when the client missed too many changes and has to
+    reload.
+    """
+    if timeout <= 0:
+        scope = await sync_to_async(event_scope)(user, project_id)
+        events = await _backlog(after, scope)
+        if not events:
+            return events, after
+        return events, events[-1]['id']
+
+    feed = get_feed()
+    subscription = await feed.subscribe()
+    try:
+        scope = await sync_to_async(event_scope)(user, project_id)
+        seen = max(after, feed.cursor)
+        events = await _backlog(after, scope, until=seen)
+        if events is None:
+            return None, after
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not events and not subscription.lagging:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch = await asyncio.wait_for(subscription.queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+            events = [event for event in batch if event['id'] > after and _in_scope(event, scope)]
+            seen = max(seen, batch[-1]['id'])
+        if subscription.lagging and not events:
+            return None, after
+        return events, events[-1]['id'] if events else seen
+    finally:
+        feed.unsubscribe(subscription)
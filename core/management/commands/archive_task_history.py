@@ -0,0 +1,58 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.history import archive_batch
+from core.models import TaskHistory
+
+
+class Command(BaseCommand):
+    help = 'Move task history older than the retention period to the archive table, in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.TASK_HISTORY_RETENTION_DAYS,
+            help='Archive rows older than this many days (default: TASK_HISTORY_RETENTION_DAYS).',
+        )
+        parser.add_argument('--batch-size', type=int, default=settings.TASK_HISTORY_ARCHIVE_BATCH_SIZE)
+        parser.add_argument(
+            '--max-batches', type=int, default=0,
+            help='Stop after this many batches; the next run continues from there (0: no limit).',
+        )
+        parser.add_argument(
+            '--pause', type=float, default=0,
+            help='Seconds to sleep between batches, to leave room for other writers.',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Only count the rows due for archiving.')
+
+    def handle(self, *args, **options):
+        if options['days'] < 0 or options['batch_size'] < 1:
+            raise CommandError('--days must be >= 0 and --batch-size >= 1')
+        cutoff = timezone.now() - timedelta(days=options['days'])
+
+        if options['dry_run']:
+            due = TaskHistory.objects.filter(created_at__lt=cutoff).count()
+            self.stdout.write(f'{due} history rows older than {cutoff:%Y-%m-%d %H:%M} are due for archiving')
+            return
+
+        moved = 0
+        batches = 0
+        while True:
+            count = archive_batch(cutoff, options['batch_size'])
+            if not count:
+                break
+            moved += count
+            batches += 1
+            if options['verbosity'] > 1:
+                self.stdout.write(f'Batch {batches}: archived {count} rows')
+            if options['max_batches'] and batches >= options['max_batches']:
+                break
+            if options['pause']:
+                time.sleep(options['pause'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {moved} history rows older than {cutoff:%Y-%m-%d %H:%M} in {batches} batches'
+        ))
@@ -0,0 +1,200 @@
+import json
+import statistics
+from contextlib import ExitStack
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.test import Client
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+
+from core import urls as core_urls
+from core.access import visible_project_ids
+from core.metrics import QueryTracker, percentile
+from core.models import Project, Task, User
+
+# JSON bodies for the views that only accept POST
+POST_PAYLOADS = {
+    'update_task_status': lambda sample: {'task_id': sample['task'].pk, 'status': 'in_progress'},
+    'bulk_update_task_status': lambda sample: {
+        'changes': [{'task_id': pk, 'status': 'in_progress'} for pk in sample['task_ids']],
+    },
+}
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+class Command(BaseCommand):
+    help = (
+        'Request every view in core/urls.py through the test client as a super admin '
+        'and as a developer, and report latency percentiles and query counts.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--admin', help='Username of the super admin to use.')
+        parser.add_argument('--developer', help='Username of the developer to use.')
+        parser.add_argument('--view', action='append', dest='views', help='Only benchmark this URL name.')
+        parser.add_argument('--output', '-o', help='Write machine-readable results to this JSON file.')
+        parser.add_argument('--compare', help='Previous results file to compare against.')
+
+    def handle(self, *args, **options):
+        users = {
+            'super_admin': self.pick_user('super_admin', options['admin']),
+            'developer': self.pick_user('developer', options['developer']),
+        }
+
+        results = []
+        for role, user in users.items():
+            sample = self.sample_objects(user)
+            client = Client(HTTP_HOST='localhost')
+            client.force_login(user)
+            for pattern in core_urls.urlpatterns:
+                if not isinstance(pattern, URLPattern) or not pattern.name:
+                    continue
+                if options['views'] and pattern.name not in options['views']:
+                    continue
+                result = self.benchmark(client, pattern, sample, options['iterations'], options['warmup'])
+                result['role'] = role
+                results.append(result)
+                self.report(result)
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump({
+                    'created_at': timezone.now().isoformat(),
+                    'iterations': options['iterations'],
+                    'counts': {
+                        'projects': Project.objects.count(),
+                        'tasks': Task.objects.count(),
+                    },
+                    'results': results,
+                }, output, indent=2)
+            self.stdout.write(f'Results written to {options["output"]}')
+
+        if options['compare']:
+            self.compare(results, options['compare'])
+
+    def pick_user(self, role, username):
+        users = User.objects.filter(role=role, is_active=True)
+        if username:
+            users = users.filter(username=username)
+        elif role == 'developer':
+            # Prefer a developer who can actually see something
+            with_projects = users.filter(assigned_projects__isnull=False).distinct()
+            users = with_projects if with_projects.exists() else users
+        user = users.order_by('pk').first()
+        if user is None:
+            raise CommandError(f'No active {role} user found; run seed_data first.')
+        return user
+
+    def sample_objects(self, user):
+        if user.is_super_admin:
+            projects = Project.objects.all()
+            tasks = Task.objects.all()
+        else:
+            projects = Project.objects.filter(pk__in=visible_project_ids(user))
+            tasks = Task.objects.filter(assignee=user)
+        project = projects.order_by('-todo_count').first()
+        task_ids = list(tasks.order_by('-pk').values_list('pk', flat=True)[:50])
+        return {
+            'project': project,
+            'task': tasks.order_by('-pk').first(),
+            'task_ids': task_ids,
+        }
+
+    def url_kwargs(self, pattern, sample):
+        kwargs = {}
+        for name in pattern.pattern.converters:
+            if name == 'pk' and sample['project']:
+                kwargs[name] = sample['project'].pk
+            elif name == 'status':
+                kwargs[name] = 'todo'
+            else:
+                return None
+        return kwargs
+
+    def benchmark(self, client, pattern, sample, iterations, warmup):
+        result = {'view': pattern.name}
+        kwargs = self.url_kwargs(pattern, sample)
+        payload = POST_PAYLOADS.get(pattern.name)
+        if kwargs is None or (payload and not sample['task']):
+            result['skipped'] = 'no sample data for URL arguments'
+            return result
+
+        url = reverse(pattern.name, kwargs=kwargs)
+        timings = []
+        queries = []
+        statuses = set()
+        for i in range(warmup + iterations):
+            tracker = QueryTracker()
+            with ExitStack() as stack:
+                # Writes are rolled back so runs are repeatable
+                stack.enter_context(transaction.atomic())
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(tracker))
+                start = perf_counter()
+                try:
+                    if payload:
+                        response = client.post(url, json.dumps(payload(sample)), content_type='application/json')
+                    else:
+                        response = client.get(url)
+                    if response.streaming:
+                        for _ in response.streaming_content:
+                            pass
+                except Exception as exc:
+                    transaction.set_rollback(True)
+                    result['error'] = repr(exc)
+                    return result
+                elapsed = perf_counter() - start
+                transaction.set_rollback(True)
+            if i >= warmup:
+                timings.append(elapsed * 1000)
+                queries.append(tracker.count)
+                statuses.add(response.status_code)
+
+        result.update({
+            'url': url,
+            'method': 'POST' if payload else 'GET',
+            'status_codes': sorted(statuses),
+            'mean_ms': round(statistics.mean(timings), 3),
+            'max_ms': round(max(timings), 3),
+            'queries': max(queries),
+            'min_queries': min(queries),
+        })
+        for pct in PERCENTILES:
+            result[f'p{pct}_ms'] = round(percentile(timings, pct), 3)
+        return result
+
+    def report(self, result):
+        label = f'{result["role"]:<12} {result["view"]:<28}'
+        if 'skipped' in result or 'error' in result:
+            self.stdout.write(self.style.WARNING(f'{label} {result.get("skipped") or result["error"]}'))
+            return
+        self.stdout.write(
+            f'{label} p50 {result["p50_ms"]:>8.2f}ms  p95 {result["p95_ms"]:>8.2f}ms  '
+            f'p99 {result["p99_ms"]:>8.2f}ms  queries {result["queries"]:>3}  '
+            f'status {",".join(map(str, result["status_codes"]))}'
+        )
+
+    def compare(self, results, path):
+        with open(path) as previous_file:
+            previous = {
+                (result['role'], result['view']): result
+                for result in json.load(previous_file)['results']
+            }
+        self.stdout.write('\nChange against ' + path)
+        for result in results:
+            before = previous.get((result['role'], result['view']))
+            if not before or 'p50_ms' not in before or 'p50_ms' not in result:
+                continue
+            change = (result['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100 if before['p50_ms'] else 0
+            queries = result['queries'] - before['queries']
+            line = (
+                f'{result["role"]:<12} {result["view"]:<28} p50 {change:+7.1f}%  '
+                f'queries {queries:+d}'
+            )
+            regressed = change > 20 or queries > 0
+            self.stdout.write(self.style.ERROR(line) if regressed else line)
@@ -0,0 +1,76 @@
+import shlex
+import subprocess
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from core import assets
+from core.assets import BUNDLE, COMPRESSIBLE
+
+
+class Command(BaseCommand):
+    help = (
+        'Compile the Tailwind classes used in the templates into a purged, minified CSS bundle, '
+        'then collect static files under content-hashed names with gzip/brotli copies.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--skip-css', action='store_true',
+            help='Keep the existing bundle and only collect and compress static files.',
+        )
+
+    def handle(self, *args, **options):
+        output = Path(settings.STATICFILES_DIRS[0]) / BUNDLE
+        if not options['skip_css']:
+            self.build_css(output)
+        elif not output.exists():
+            raise CommandError(f'{output} does not exist; run without --skip-css first')
+
+        call_command('collectstatic', interactive=False, verbosity=0)
+        self.report()
+
+    def build_css(self, output):
+        output.parent.mkdir(parents=True, exist_ok=True)
+        command = shlex.split(settings.TAILWIND_CLI) + [
+            '--config', str(settings.BASE_DIR / 'tailwind.config.js'),
+            '--input', str(settings.BASE_DIR / 'assets' / 'tailwind.css'),
+            '--output', str(output),
+            '--minify',
+        ]
+        try:
+            # Content paths in tailwind.config.js are relative to the project root
+            subprocess.run(command, cwd=settings.BASE_DIR, check=True)
+        except FileNotFoundError:
+            raise CommandError(
+                f'Tailwind CLI not found ({settings.TAILWIND_CLI}). Install Node.js or the '
+                'standalone tailwindcss binary and point TAILWIND_CLI at it.'
+            )
+        except subprocess.CalledProcessError as exc:
+            raise CommandError(f'Tailwind CLI failed with exit code {exc.returncode}')
+        self.stdout.write(f'Built {output} ({output.stat().st_size / 1024:.1f} KiB)')
+
+    def report(self):
+        hashed = sorted(set(staticfiles_storage.hashed_files.values()))
+        compressible = [name for name in hashed if name.endswith(COMPRESSIBLE)]
+        totals = {'': 0, '.gz': 0, '.br': 0}
+        for name in compressible:
+            path = Path(staticfiles_storage.path(name))
+            size = path.stat().st_size
+            totals[''] += size
+            for suffix in ('.gz', '.br'):
+                copy = path.with_name(path.name + suffix)
+                totals[suffix] += copy.stat().st_size if copy.exists() else size
+        bundle = staticfiles_storage.hashed_files.get(BUNDLE)
+        self.stdout.write(self.style.SUCCESS(
+            f'Collected {len(hashed)} hashed files into {settings.STATIC_ROOT}; '
+            f'bundle: {bundle}'
+        ))
+        brotli = f'{totals[".br"] / 1024:.1f} KiB' if assets.brotli else 'not installed'
+        self.stdout.write(
+            f'Text assets: {totals[""] / 1024:.1f} KiB, gzip {totals[".gz"] / 1024:.1f} KiB, '
+            f'brotli {brotli}'
+        )
@@ -0,0 +1,55 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from core import exports, history
+from core.db_routers import use_reporting
+
+
+class Command(BaseCommand):
+    help = 'Stream work logs or task history to CSV/NDJSON in constant memory.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=['worklogs', 'history'])
+        parser.add_argument('--format', choices=sorted(exports.FORMATS), default='csv')
+        parser.add_argument('--start', help='First date to include (YYYY-MM-DD).')
+        parser.add_argument('--end', help='Last date to include (YYYY-MM-DD).')
+        parser.add_argument('--project', type=int, help='Only export this project id.')
+        parser.add_argument('--output', '-o', help='Write to this file instead of stdout.')
+        parser.add_argument('--chunk-size', type=int, default=exports.DEFAULT_CHUNK_SIZE)
+
+    def _date(self, value):
+        if not value:
+            return None
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise CommandError(f'Invalid date: {value}')
+        return parsed
+
+    def handle(self, *args, **options):
+        start = self._date(options['start'])
+        end = self._date(options['end'])
+        if options['kind'] == 'worklogs':
+            querysets = [exports.worklog_queryset(start, end, options['project'])]
+            columns = exports.WORKLOG_COLUMNS
+        else:
+            # Recent and archived history
+            querysets = [
+                exports.history_queryset(start, end, options['project'], model)
+                for model in history.STORES
+            ]
+            columns = exports.HISTORY_COLUMNS
+
+        rows = exports.iter_merged_rows(querysets, columns, chunk_size=options['chunk_size'])
+        lines = exports.render(rows, columns, options['format'])
+
+        with use_reporting():
+            if options['output']:
+                with open(options['output'], 'w', newline='', encoding='utf-8') as output:
+                    output.writelines(lines)
+            else:
+                sys.stdout.writelines(lines)
@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.imports import IMPORTERS, ImportFileError, import_csv
+from core.models import User
+
+
+class Command(BaseCommand):
+    help = 'Bulk import tasks or work logs from a CSV file with a header row.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(IMPORTERS))
+        parser.add_argument('path', help='CSV file (UTF-8)')
+        parser.add_argument(
+            '--user', required=True,
+            help='Username that creates the tasks and owns work logs without a user column.',
+        )
+        parser.add_argument('--batch-size', type=int, default=settings.IMPORT_BATCH_SIZE)
+        parser.add_argument(
+            '--atomic', action='store_true',
+            help='Import nothing if any row is rejected (default: skip bad rows).',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Only validate the rows.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be >= 1')
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f'User "{options["user"]}" not found')
+
+        try:
+            with open(options['path'], newline='', encoding='utf-8-sig') as file:
+                result = import_csv(
+                    options['kind'], file, user,
+                    batch_size=options['batch_size'],
+                    dry_run=options['dry_run'],
+                    atomic=options['atomic'],
+                )
+        except (OSError, ImportFileError) as exc:
+            raise CommandError(exc)
+
+        for line, message in result.errors:
+            self.stderr.write(f'line {line}: {message}')
+
+        summary = f'{result.rows} rows read, {len(result.errors)} rejected'
+        if result.dry_run:
+            self.stdout.write(f'{summary}; {result.valid} {result.kind} would be imported')
+        elif result.rolled_back:
+            self.stdout.write(self.style.ERROR(f'{summary}; nothing imported'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{summary}; imported {result.created} {result.kind}'))
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = 'Rebuild (or verify) the denormalized per-project task counters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify', action='store_true',
+            help='Only report projects with wrong counters; exit with an error if any are found.',
+        )
+        parser.add_argument(
+            '--project', type=int, action='append', dest='projects',
+            help='Limit to this project id (can be repeated).',
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        verify = options['verify']
+        with transaction.atomic():
+            mismatches = rebuild_counters(
+                project_ids=options['projects'],
+                fix=not verify,
+                batch_size=options['batch_size'],
+            )
+
+        for project, stored, expected in mismatches:
+            changes = ', '.join(
+                f'{field} {stored[field]} -> {expected[field]}'
+                for field in expected if stored[field] != expected[field]
+            )
+            self.stdout.write(f'Project {project.pk} ({project.name}): {changes}')
+
+        if verify:
+            if mismatches:
+                raise CommandError(f'{len(mismatches)} project(s) have incorrect task counters.')
+            self.stdout.write(self.style.SUCCESS('All project task counters are correct.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Fixed {len(mismatches)} project(s).'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from core.models import TimesheetRollup
+from core.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily, weekly and monthly timesheet rollups from the work logs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {TimesheetRollup.objects.count()} timesheet rollup rows.'
+        ))
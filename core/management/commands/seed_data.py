@@ -0,0 +1,217 @@
+import random
+from array import array
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core import counters, overdue, rollups, search
+from core.models import Project, Task, TaskHistory, User, WorkLog
+
+WORDS = (
+    'api auth backend billing cache client dashboard database deploy design docs '
+    'export feature fix frontend invoice login migration mobile onboarding payment '
+    'performance report search security settings signup sync test timesheet upload'
+).split()
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    # Let bulk_create store the generated created_at/updated_at values
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = 'Seed a synthetic dataset of users, projects, tasks, work logs and history.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--admins', type=int, default=2, help='How many of the users are super admins.')
+        parser.add_argument('--projects', type=int, default=20)
+        parser.add_argument('--members', type=int, default=8, help='Members per project.')
+        parser.add_argument('--tasks', type=int, default=10000)
+        parser.add_argument('--worklogs', type=int, default=20000)
+        parser.add_argument('--days', type=int, default=365, help='Spread the data over this many days.')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--prefix', default='seed', help='Username and project name prefix.')
+        parser.add_argument('--password', default='password')
+        parser.add_argument('--seed', type=int, help='Random seed for a reproducible dataset.')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.days = options['days']
+        prefix = options['prefix']
+
+        if User.objects.filter(username__startswith=f'{prefix}_').exists():
+            raise CommandError(f'Users with the prefix "{prefix}_" already exist; pick another --prefix.')
+        if options['admins'] > options['users']:
+            raise CommandError('--admins cannot be larger than --users.')
+
+        with explicit_timestamps(Project, Task, TaskHistory, WorkLog):
+            user_ids = self.seed_users(prefix, options['users'], options['admins'], options['password'])
+            project_ids, project_members = self.seed_projects(
+                prefix, options['projects'], options['members'], user_ids
+            )
+            task_ids, task_projects = self.seed_tasks(options['tasks'], project_ids, project_members)
+            self.seed_worklogs(options['worklogs'], task_ids, task_projects, project_members)
+
+        # Derived data is rebuilt in bulk rather than maintained row by row
+        self.stdout.write('Rebuilding task counters, overdue flags, timesheet rollups and search index...')
+        counters.rebuild_counters()
+        overdue.sweep(batch_size=self.batch_size)
+        overdue.build_digests()
+        rollups.rebuild(batch_size=self.batch_size)
+        if search.is_available():
+            search.rebuild()
+        cache.clear()
+        self.stdout.write(self.style.SUCCESS('Done.'))
+
+    def random_time(self):
+        return self.now - timedelta(seconds=self.rng.randrange(self.days * 86400))
+
+    def insert(self, model, objects):
+        with transaction.atomic():
+            return model.objects.bulk_create(objects, batch_size=self.batch_size)
+
+    def seed_users(self, prefix, count, admins, password):
+        password = make_password(password)
+        users = [
+            User(
+                username=f'{prefix}_user_{i}',
+                email=f'{prefix}_user_{i}@example.com',
+                password=password,
+                role='super_admin' if i < admins else 'developer',
+            )
+            for i in range(count)
+        ]
+        user_ids = [user.pk for user in self.insert(User, users)]
+        self.stdout.write(f'Created {len(user_ids)} users')
+        return user_ids
+
+    def seed_projects(self, prefix, count, members_per_project, user_ids):
+        projects = []
+        for i in range(count):
+            created_at = self.random_time()
+            projects.append(Project(
+                name=f'{prefix} project {i}',
+                description=' '.join(self.rng.choices(WORDS, k=12)),
+                created_by_id=self.rng.choice(user_ids),
+                created_at=created_at,
+                updated_at=created_at,
+            ))
+        project_ids = [project.pk for project in self.insert(Project, projects)]
+
+        Membership = Project.members.through
+        project_members = {}
+        memberships = []
+        for project, project_id in zip(projects, project_ids):
+            members = self.rng.sample(user_ids, min(members_per_project, len(user_ids)))
+            project_members[project_id] = [project.created_by_id, *members]
+            memberships.extend(Membership(project_id=project_id, user_id=pk) for pk in members)
+        self.insert(Membership, memberships)
+        self.stdout.write(f'Created {len(project_ids)} projects with {len(memberships)} memberships')
+        return project_ids, project_members
+
+    def seed_tasks(self, count, project_ids, project_members):
+        statuses = [status for status, _ in Task.STATUS_CHOICES]
+        priorities = [priority for priority, _ in Task.PRIORITY_CHOICES]
+        task_ids = array('q')
+        task_projects = array('q')
+        history_count = 0
+
+        for start in range(0, count, self.batch_size):
+            tasks = []
+            history = []
+            for _ in range(min(self.batch_size, count - start)):
+                project_id = self.rng.choice(project_ids)
+                members = project_members[project_id]
+                created_at = self.random_time()
+                due_date = None
+                if self.rng.random() < 0.7:
+                    due_date = (created_at + timedelta(days=self.rng.randint(-10, 60))).date()
+                task = Task(
+                    title=' '.join(self.rng.choices(WORDS, k=4)).capitalize(),
+                    description=' '.join(self.rng.choices(WORDS, k=20)),
+                    project_id=project_id,
+                    assignee_id=self.rng.choice(members),
+                    created_by_id=self.rng.choice(members),
+                    status=self.rng.choices(statuses, weights=(3, 2, 5))[0],
+                    priority=self.rng.choice(priorities),
+                    due_date=due_date,
+                    created_at=created_at,
+                )
+                # Also sets updated_at to the last status change
+                history.extend(self.task_history(task))
+                tasks.append(task)
+
+            # History rows pick up the task ids assigned by the insert
+            self.insert(Task, tasks)
+            self.insert(TaskHistory, history)
+            for task in tasks:
+                task_ids.append(task.pk)
+                task_projects.append(task.project_id)
+            history_count += len(history)
+
+        self.stdout.write(f'Created {len(task_ids)} tasks and {history_count} history rows')
+        return task_ids, task_projects
+
+    def task_history(self, task):
+        at = task.created_at
+        history = [TaskHistory(
+            task=task, user_id=task.created_by_id, action='created', new_value='todo', created_at=at,
+            description=f'Task "{task.title}" was created',
+        )]
+        path = {'todo': [], 'in_progress': ['in_progress'], 'done': ['in_progress', 'done']}
+        previous = 'todo'
+        for status in path[task.status]:
+            at = min(at + timedelta(hours=self.rng.randint(1, 240)), self.now)
+            history.append(TaskHistory(
+                task=task, user_id=task.assignee_id, action='status_changed',
+                old_value=previous, new_value=status, created_at=at,
+                description=f'Task status changed from {previous} to {status}',
+            ))
+            previous = status
+        task.updated_at = at
+        return history
+
+    def seed_worklogs(self, count, task_ids, task_projects, project_members):
+        project_ids = list(project_members)
+        created = 0
+        for start in range(0, count, self.batch_size):
+            work_logs = []
+            for _ in range(min(self.batch_size, count - start)):
+                if task_ids and self.rng.random() < 0.8:
+                    index = self.rng.randrange(len(task_ids))
+                    task_id, project_id = task_ids[index], task_projects[index]
+                else:
+                    task_id, project_id = None, self.rng.choice(project_ids)
+                created_at = self.random_time()
+                work_logs.append(WorkLog(
+                    user_id=self.rng.choice(project_members[project_id]),
+                    project_id=project_id,
+                    task_id=task_id,
+                    description=' '.join(self.rng.choices(WORDS, k=10)),
+                    hours_spent=self.rng.choice((0.5, 1, 1.5, 2, 3, 4, 6, 8)),
+                    date=created_at.date(),
+                    created_at=created_at,
+                    updated_at=created_at,
+                ))
+            created += len(self.insert(WorkLog, work_logs))
+        self.stdout.write(f'Created {created} work logs')
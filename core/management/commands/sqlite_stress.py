@@ -0,0 +1,141 @@
+import random
+import threading
+from contextlib import nullcontext
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections, transaction
+from django.db.models import Count, Q
+
+from core.db_routers import reporting_enabled, use_reporting
+from core.metrics import percentile
+from core.models import Task
+
+NEXT_STATUS = {'todo': 'in_progress', 'in_progress': 'done', 'done': 'todo'}
+
+
+class Command(BaseCommand):
+    help = (
+        'Run concurrent task status writes against project/task reads and report '
+        'throughput, latency and "database is locked" errors. Task statuses are '
+        'restored afterwards, but run it against a copy of the database. Compare '
+        'runs with SQLITE_TUNED off and on.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=4)
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=10, help='Seconds to run.')
+        parser.add_argument('--reporting', action='store_true',
+                            help='Send reads to the read-only reporting connection.')
+        parser.add_argument('--seed', type=int)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('sqlite_stress only makes sense on SQLite.')
+        if options['reporting'] and not reporting_enabled():
+            raise CommandError('--reporting needs the tuned profile (SQLITE_TUNED=True).')
+
+        task_ids = list(Task.objects.values_list('pk', flat=True)[:10000])
+        project_ids = list(Task.objects.order_by().values_list('project_id', flat=True).distinct())
+        if not task_ids:
+            raise CommandError('No tasks to work with; run seed_data first.')
+
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            journal_mode = cursor.fetchone()[0]
+            cursor.execute('PRAGMA synchronous')
+            synchronous = cursor.fetchone()[0]
+        self.stdout.write(
+            f'journal_mode={journal_mode} synchronous={synchronous} '
+            f'writers={options["writers"]} readers={options["readers"]} '
+            f'duration={options["duration"]}s reads_on={"reporting" if options["reporting"] else "default"}'
+        )
+
+        rng = random.Random(options['seed'])
+        # Each writer owns a disjoint slice of tasks so statuses can be restored
+        rng.shuffle(task_ids)
+        slices = [task_ids[i::options['writers']] for i in range(options['writers'])]
+
+        stop = threading.Event()
+        results = {'write': [], 'read': []}
+        originals = {}
+        lock = threading.Lock()
+
+        def run(kind, operation):
+            timings, errors = [], 0
+            try:
+                while not stop.is_set():
+                    start = perf_counter()
+                    try:
+                        operation()
+                    except OperationalError as exc:
+                        if 'locked' not in str(exc) and 'busy' not in str(exc):
+                            raise
+                        errors += 1
+                        continue
+                    timings.append(perf_counter() - start)
+            finally:
+                connections.close_all()
+                with lock:
+                    results[kind].append((timings, errors))
+
+        def writer(own_ids):
+            local_rng = random.Random(rng.random())
+
+            def operation():
+                with transaction.atomic():
+                    task = Task.objects.get(pk=local_rng.choice(own_ids))
+                    with lock:
+                        originals.setdefault(task.pk, task.status)
+                    task.status = NEXT_STATUS[task.status]
+                    task.save()
+            return operation
+
+        def reader():
+            local_rng = random.Random(rng.random())
+            routing = use_reporting if options['reporting'] else nullcontext
+
+            def operation():
+                project_id = local_rng.choice(project_ids)
+                with routing():
+                    tasks = Task.objects.filter(project_id=project_id).select_related('assignee')
+                    list(tasks.order_by('-created_at', 'id')[:50])
+                    Task.objects.filter(project_id=project_id).aggregate(
+                        total=Count('id'), done=Count('id', filter=Q(status='done')),
+                    )
+            return operation
+
+        threads = [
+            threading.Thread(target=run, args=('write', writer(own_ids)))
+            for own_ids in slices if own_ids
+        ] + [
+            threading.Thread(target=run, args=('read', reader()))
+            for _ in range(options['readers'])
+        ]
+        for thread in threads:
+            thread.start()
+        stop.wait(options['duration'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        for kind in ('write', 'read'):
+            timings = [value * 1000 for worker, _ in results[kind] for value in worker]
+            errors = sum(errors for _, errors in results[kind])
+            if not timings:
+                self.stdout.write(f'{kind:<6} no completed operations, {errors} lock errors')
+                continue
+            self.stdout.write(
+                f'{kind:<6} {len(timings) / options["duration"]:>9.1f} ops/s  '
+                f'p50 {percentile(timings, 50):>8.2f}ms  p95 {percentile(timings, 95):>8.2f}ms  '
+                f'p99 {percentile(timings, 99):>8.2f}ms  max {max(timings):>8.2f}ms  '
+                f'lock errors {errors}'
+            )
+
+        self.stdout.write(f'Restoring {len(originals)} task statuses...')
+        for pk, status in originals.items():
+            task = Task.objects.get(pk=pk)
+            if task.status != status:
+                task.status = status
+                task.save()
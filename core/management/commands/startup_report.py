@@ -0,0 +1,118 @@
+import json
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter under -X importtime, so nothing is imported or
+# cached yet. Prints its own timings as JSON on the last stdout line.
+SCRIPT = '''
+import json, sys, time
+options = json.loads(sys.argv[1])
+start = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+report = {'setup': time.perf_counter() - start, 'phases': []}
+if options['warmup']:
+    from core import warmup
+    report['phases'] = warmup.run(database=options['database'])
+sys.stderr.write(options['marker'] + '\\n')
+if options['path']:
+    from django.test import Client
+    client = Client(HTTP_HOST='localhost')
+    start = time.perf_counter()
+    response = client.get(options['path'])
+    report['request'] = {'seconds': time.perf_counter() - start, 'status': response.status_code}
+print(json.dumps(report))
+'''
+
+MARKER = '-- end of startup --'
+
+# "import time:       412 |       1650 |     django.utils.functional"
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| *(\S+)')
+
+
+class Command(BaseCommand):
+    help = (
+        'Start the WSGI application in a fresh interpreter and report where the cold start '
+        'goes: imports by package and module, Django setup, and each warm-up phase.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=15, help='Rows per table.')
+        parser.add_argument('--no-warmup', action='store_true', help='Skip the warm-up phases.')
+        parser.add_argument(
+            '--database', action='store_true',
+            help='Include the database warm-up phase (default: WARMUP_DATABASE).',
+        )
+        parser.add_argument(
+            '--path', default='/auth/login/',
+            help='Time a first request to this path after startup (empty to skip).',
+        )
+        parser.add_argument('--output', '-o', help='Write machine-readable results to this JSON file.')
+
+    def handle(self, *args, **options):
+        script_options = {
+            'warmup': not options['no_warmup'],
+            'database': options['database'] or settings.WARMUP_DATABASE,
+            'path': options['path'],
+            'marker': MARKER,
+        }
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', SCRIPT, json.dumps(script_options)],
+            cwd=settings.BASE_DIR, capture_output=True, text=True,
+        )
+        if process.returncode:
+            raise CommandError(f'Startup failed:\n{process.stderr[-4000:]}')
+        report = json.loads(process.stdout.strip().splitlines()[-1])
+        modules = self.parse_imports(process.stderr)
+
+        packages = defaultdict(lambda: [0, 0])
+        for name, self_us in modules:
+            package = packages[name.split('.')[0]]
+            package[0] += self_us
+            package[1] += 1
+        import_seconds = sum(self_us for _, self_us in modules) / 1e6
+
+        self.stdout.write(f'Startup (imports included)   {report["setup"] * 1000:9.1f}ms')
+        for name, seconds, count in report['phases']:
+            self.stdout.write(f'Warm-up {name:<20} {seconds * 1000:9.1f}ms  ({count})')
+        if 'request' in report:
+            self.stdout.write(
+                f'First request {options["path"]:<14} {report["request"]["seconds"] * 1000:9.1f}ms  '
+                f'(status {report["request"]["status"]})'
+            )
+        self.stdout.write(f'\nImports: {len(modules)} modules, {import_seconds * 1000:.1f}ms')
+
+        self.stdout.write('\nBy package                     self      modules')
+        ranked = sorted(packages.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (self_us, count) in ranked[:options['top']]:
+            self.stdout.write(f'  {name:<26} {self_us / 1000:9.1f}ms  {count:5d}')
+
+        self.stdout.write('\nSlowest modules                self')
+        for name, self_us in sorted(modules, key=lambda item: item[1], reverse=True)[:options['top']]:
+            self.stdout.write(f'  {name:<26} {self_us / 1000:9.1f}ms')
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump({
+                    **report,
+                    'packages': {name: {'self_ms': self_us / 1000, 'modules': count}
+                                 for name, (self_us, count) in ranked},
+                    'modules': {name: self_us / 1000 for name, self_us in modules},
+                }, output, indent=2)
+            self.stdout.write(f'\nResults written to {options["output"]}')
+
+    def parse_imports(self, stderr):
+        # Imports up to the marker: startup and warm-up, not the timed request
+        modules = []
+        for line in stderr.splitlines():
+            if line == MARKER:
+                break
+            match = IMPORT_LINE.match(line)
+            if match:
+                modules.append((match.group(3), int(match.group(1))))
+        return modules
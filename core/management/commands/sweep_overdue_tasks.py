@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from core import overdue
+
+
+class Command(BaseCommand):
+    help = 'Flag tasks that became overdue (and unflag finished ones), then rebuild the overdue digests.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        flagged, cleared = overdue.sweep(batch_size=options['batch_size'])
+        digests = overdue.build_digests()
+        self.stdout.write(self.style.SUCCESS(
+            f'Flagged {flagged} overdue tasks, cleared {cleared}; {digests} users have overdue tasks'
+        ))
@@ -0,0 +1,140 @@
+import threading
+from bisect import bisect_left
+from collections import Counter
+from time import perf_counter
+
+PREFIX = 'projectmanager'
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    """In-process histograms and counters, rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._help = {}
+
+    def observe(self, name, labels, value, buckets, help_text=''):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+                self._help[name] = ('histogram', help_text)
+            histogram.observe(value)
+
+    def inc(self, name, labels, amount=1, help_text=''):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+            self._help.setdefault(name, ('counter', help_text))
+
+    def counter_value(self, name, labels):
+        return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._help.clear()
+
+    def render(self):
+        with self._lock:
+            histograms = {key: (h.buckets, list(h.counts), h.sum, h.count)
+                          for key, h in self._histograms.items()}
+            counters = dict(self._counters)
+            help_texts = dict(self._help)
+
+        lines = []
+        for name in sorted(help_texts):
+            kind, help_text = help_texts[name]
+            full_name = f'{PREFIX}_{name}'
+            lines.append(f'# HELP {full_name} {help_text}')
+            lines.append(f'# TYPE {full_name} {kind}')
+            if kind == 'counter':
+                for (key_name, labels), value in sorted(counters.items()):
+                    if key_name == name:
+                        lines.append(f'{full_name}{_labels(labels)} {value}')
+                continue
+            for (key_name, labels), (buckets, counts, total, count) in sorted(histograms.items()):
+                if key_name != name:
+                    continue
+                cumulative = 0
+                for bound, bucket_count in zip((*buckets, '+Inf'), counts):
+                    cumulative += bucket_count
+                    lines.append(f'{full_name}_bucket{_labels(labels + (("le", bound),))} {cumulative}')
+                lines.append(f'{full_name}_sum{_labels(labels)} {total}')
+                lines.append(f'{full_name}_count{_labels(labels)} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+
+registry = Registry()
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of ``values``."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class QueryTracker:
+    """``connection.execute_wrapper`` that counts and times SQL queries."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self._seen = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += perf_counter() - start
+            self.count += 1
+            self._seen[sql if many else (sql, repr(params))] += 1
+
+    @property
+    def duplicates(self):
+        """Queries that repeated an earlier query with the same parameters."""
+        return sum(n - 1 for n in self._seen.values())
+
+
+def record_request(view, elapsed, tracker):
+    labels = {'view': view}
+    registry.observe('request_duration_seconds', labels, elapsed, DURATION_BUCKETS,
+                     'Wall time of requests per view.')
+    registry.observe('sql_queries', labels, tracker.count, QUERY_BUCKETS,
+                     'SQL queries issued per request.')
+    registry.observe('sql_duration_seconds', labels, tracker.duration, DURATION_BUCKETS,
+                     'Time spent in SQL per request.')
+    registry.observe('sql_duplicate_queries', labels, tracker.duplicates, QUERY_BUCKETS,
+                     'Repeated identical SQL queries per request.')
@@ -0,0 +1,151 @@
+import logging
+import mimetypes
+from contextlib import ExitStack
+from functools import partial
+from pathlib import Path
+from time import perf_counter
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.functional import SimpleLazyObject
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from . import authcache
+from .assets import ENCODINGS
+from .metrics import QueryTracker, record_request
+
+logger = logging.getLogger('core.metrics')
+
+
+class RequestMetricsMiddleware:
+    """Record wall time, SQL query count/time and duplicate queries per view.
+
+    Disabled entirely (not even instantiated per request) unless
+    ``METRICS_ENABLED`` is set.
+    """
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.budgets = settings.METRICS_BUDGETS
+
+    def __call__(self, request):
+        tracker = QueryTracker()
+        start = perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(tracker))
+            response = self.get_response(request)
+        elapsed = perf_counter() - start
+
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        record_request(view, elapsed, tracker)
+        self.check_budget(request, view, elapsed, tracker)
+        return response
+
+    def check_budget(self, request, view, elapsed, tracker):
+        budget = self.budgets.get(view, self.budgets.get('default', {}))
+        max_queries = budget.get('queries')
+        max_ms = budget.get('ms')
+        if (max_queries is not None and tracker.count > max_queries) or (
+            max_ms is not None and elapsed * 1000 > max_ms
+        ):
+            logger.warning(
+                'Request over budget: view=%s path=%s time=%.1fms (budget %s) '
+                'queries=%d (budget %s) sql_time=%.1fms duplicates=%d',
+                view, request.path, elapsed * 1000, max_ms,
+                tracker.count, max_queries, tracker.duration * 1000, tracker.duplicates,
+            )
+
+
+def _get_user(request):
+    if not hasattr(request, '_cached_user'):
+        request._cached_user = authcache.get_user(request)
+    return request._cached_user
+
+
+async def _auser(request):
+    if not hasattr(request, '_acached_user'):
+        request._acached_user = await sync_to_async(authcache.get_user)(request)
+    return request._acached_user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """AuthenticationMiddleware that loads ``request.user`` through core.authcache."""
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: _get_user(request))
+        request.auser = partial(_auser, request)
+
+
+class StaticAssetMiddleware:
+    """Serve the collected files in ``STATIC_ROOT``.
+
+    Picks the precompressed .br/.gz copy the client accepts. Content-hashed
+    names never change, so they are cached for a year; the plain names are
+    revalidated with Last-Modified. Runs right after SecurityMiddleware, so
+    static responses get its headers while static requests skip sessions,
+    authentication and metrics. Disabled with
+    ``SERVE_STATIC=False`` (e.g. when a CDN or the web server serves them).
+    """
+
+    def __init__(self, get_response):
+        if not settings.SERVE_STATIC:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL
+        self.root = Path(settings.STATIC_ROOT).resolve()
+        self.hashed = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD') and request.path.startswith(self.prefix):
+            response = self.serve(request, request.path[len(self.prefix):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def serve(self, request, name):
+        path = (self.root / name).resolve()
+        if not path.is_relative_to(self.root) or not path.is_file():
+            return None
+
+        mtime = path.stat().st_mtime
+        if name in self.hashed:
+            cache_control = f'public, max-age={settings.STATIC_MAX_AGE}, immutable'
+        else:
+            cache_control = 'public, no-cache'
+            if not was_modified_since(request.headers.get('If-Modified-Since'), mtime):
+                response = HttpResponseNotModified()
+                response['Cache-Control'] = cache_control
+                return response
+
+        content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        accepted = {
+            token.split(';')[0].strip()
+            for token in request.headers.get('Accept-Encoding', '').split(',')
+            if not token.replace(' ', '').endswith(';q=0')
+        }
+        encoding = None
+        for token, suffix in ENCODINGS:
+            candidate = path.with_name(path.name + suffix)
+            if token in accepted and candidate.is_file():
+                path, encoding = candidate, token
+                break
+
+        response = FileResponse(path.open('rb'), content_type=content_type)
+        if encoding:
+            response['Content-Encoding'] = encoding
+        response['Cache-Control'] = cache_control
+        response['Last-Modified'] = http_date(mtime)
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:04
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_counters(apps, schema_editor):
+    Project = apps.get_model('core', 'Project')
+    Task = apps.get_model('core', 'Task')
+    fields = {'todo': 'todo_count', 'in_progress': 'in_progress_count', 'done': 'done_count'}
+
+    counts = {}
+    rows = Task.objects.order_by().values_list('project_id', 'status').annotate(n=Count('id'))
+    for project_id, status, n in rows:
+        if status in fields:
+            counts.setdefault(project_id, {})[fields[status]] = n
+
+    for project_id, values in counts.items():
+        Project.objects.filter(pk=project_id).update(**values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='done_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='in_progress_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='todo_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:09
+
+import django.db.models.deletion
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+
+
+def populate_rollups(apps, schema_editor):
+    WorkLog = apps.get_model('core', 'WorkLog')
+    TimesheetRollup = apps.get_model('core', 'TimesheetRollup')
+    for grain, truncate in (('day', TruncDay), ('week', TruncWeek), ('month', TruncMonth)):
+        rows = (
+            WorkLog.objects.order_by()
+            .annotate(period=truncate('date'))
+            .values('period', 'user_id', 'project_id', 'task_id')
+            .annotate(total_hours=Sum('hours_spent'), total_entries=Count('id'))
+        )
+        TimesheetRollup.objects.bulk_create([
+            TimesheetRollup(
+                grain=grain, period_start=row['period'], user_id=row['user_id'],
+                project_id=row['project_id'], task_id=row['task_id'],
+                hours=row['total_hours'] or 0, entries=row['total_entries'],
+            )
+            for row in rows
+        ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_task_created_id_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimesheetRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('grain', models.CharField(choices=[('day', 'Day'), ('week', 'Week'), ('month', 'Month')], max_length=5)),
+                ('period_start', models.DateField()),
+                ('hours', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('entries', models.IntegerField(default=0)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.project')),
+                ('task', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.task')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['grain', 'period_start'], name='rollup_grain_period_idx'), models.Index(fields=['grain', 'user', 'period_start'], name='rollup_grain_user_idx'), models.Index(fields=['grain', 'project', 'period_start'], name='rollup_grain_project_idx')],
+                'constraints': [models.UniqueConstraint(models.F('grain'), models.F('period_start'), models.F('user'), models.F('project'), django.db.models.functions.comparison.Coalesce(models.F('task'), models.Value(0)), name='unique_timesheet_rollup')],
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
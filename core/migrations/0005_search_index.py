@@ -0,0 +1,41 @@
+from django.db import migrations
+
+# Kept in sync with core.search, which owns the table at runtime
+CREATE_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS core_search_index USING fts5("
+    "project_id UNINDEXED, title, body, tokenize = 'porter unicode61 remove_diacritics 2')"
+)
+
+POPULATE_SQL = [
+    "INSERT INTO core_search_index (rowid, project_id, title, body) "
+    "SELECT id * 4 + 1, project_id, title, description FROM core_task",
+    "INSERT INTO core_search_index (rowid, project_id, title, body) "
+    "SELECT id * 4 + 2, id, name, description FROM core_project",
+    "INSERT INTO core_search_index (rowid, project_id, title, body) "
+    "SELECT id * 4 + 3, project_id, '', description FROM core_worklog",
+]
+
+
+def create_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(CREATE_SQL)
+    for sql in POPULATE_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute('DROP TABLE IF EXISTS core_search_index')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_timesheet_rollups'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
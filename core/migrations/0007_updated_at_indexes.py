@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_task_project_updated_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['updated_at'], name='task_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='worklog',
+            index=models.Index(fields=['project', 'updated_at'], name='worklog_project_updated_idx'),
+        ),
+    ]
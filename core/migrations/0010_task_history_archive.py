@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_task_board_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTaskHistory',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('action', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('status_changed', 'Status Changed'), ('assigned', 'Assigned'), ('completed', 'Completed')], max_length=20)),
+                ('old_value', models.TextField(blank=True)),
+                ('new_value', models.TextField(blank=True)),
+                ('description', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name_plural': 'archived task history',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='taskhistory',
+            index=models.Index(fields=['-created_at', 'id'], name='history_created_id_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedtaskhistory',
+            name='task',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_history', to='core.task'),
+        ),
+        migrations.AddField(
+            model_name='archivedtaskhistory',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='archivedtaskhistory',
+            index=models.Index(fields=['-created_at', 'id'], name='archive_created_id_idx'),
+        ),
+    ]
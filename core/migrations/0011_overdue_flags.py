@@ -0,0 +1,50 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def flag_overdue_tasks(apps, schema_editor):
+    Task = apps.get_model('core', 'Task')
+    Task.objects.filter(
+        status__in=['todo', 'in_progress'],
+        due_date__lt=timezone.now().date(),
+    ).update(overdue=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_task_history_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OverdueDigest',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='overdue_digest', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total', models.IntegerField(default=0)),
+                ('high_count', models.IntegerField(default=0)),
+                ('medium_count', models.IntegerField(default=0)),
+                ('low_count', models.IntegerField(default=0)),
+                ('top_tasks', models.JSONField(default=list)),
+                ('built_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='overdue',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'due_date'], name='task_status_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('overdue', True)), fields=['assignee', 'due_date'], name='task_overdue_idx'),
+        ),
+        migrations.RunPython(flag_overdue_tasks, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,42 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
+
+class TrackedFieldsMixin:
+    # Remember the values of ``tracked_fields`` as stored in the database so
+    # post_save/post_delete receivers can compute deltas from
+    # ``instance._loaded_values`` without re-reading the row.
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_loaded_values()
+        return instance
+
+    def remember_loaded_values(self):
+        self._loaded_values = {
+            name: self.__dict__[name]
+            for name in self.tracked_fields
+            if name in self.__dict__
+        }
+
+    def save(self, *args, **kwargs):
+        loaded = getattr(self, '_loaded_values', {})
+        if self.pk is not None and not set(self.tracked_fields) <= loaded.keys():
+            # Built by hand with a pk, or loaded with tracked fields deferred
+            self._loaded_values = type(self)._base_manager.filter(pk=self.pk).values(
+                *self.tracked_fields
+            ).first() or {}
+        # Keep the row and the denormalized data maintained by post_save
+        # receivers in one transaction
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+        self.remember_loaded_values()
+
+
 class User(AbstractUser):
     ROLE_CHOICES = [
         ('super_admin', 'Super Admin'),
@@ -24,7 +59,7 @@ class User(AbstractUser):
         return self.role == 'developer'
 
 
-class Project(models.Model):
+class Project(TrackedFieldsMixin, models.Model):
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='created_projects')
@@ -33,6 +68,17 @@ class Project(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
 
+    # Denormalized task counters, maintained by core.counters
+    todo_count = models.IntegerField(default=0, editable=False)
+    in_progress_count = models.IntegerField(default=0, editable=False)
+    done_count = models.IntegerField(default=0, editable=False)
+
+    # Incremented whenever the project's tasks, members or work logs change;
+    # keys the cached template fragments of the project (core.fragments)
+    version = models.IntegerField(default=0, editable=False)
+
+    tracked_fields = ('created_by_id',)
+
     class Meta:
         ordering = ['-created_at']
 
@@ -41,20 +87,21 @@ class Project(models.Model):
 
     @property
     def total_tasks(self):
-        return self.tasks.count()
+        return self.todo_count + self.in_progress_count + self.done_count
 
     @property
     def completed_tasks(self):
-        return self.tasks.filter(status='done').count()
+        return self.done_count
 
     @property
     def progress_percentage(self):
-        if self.total_tasks == 0:
+        total = self.total_tasks
+        if total == 0:
             return 0
-        return int((self.completed_tasks / self.total_tasks) * 100)
+        return int((self.done_count / total) * 100)
 
 
-class Task(models.Model):
+class Task(TrackedFieldsMixin, models.Model):
     STATUS_CHOICES = [
         ('todo', 'To Do'),
         ('in_progress', 'In Progress'),
@@ -78,20 +125,66 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Precomputed by save() and by the sweep_overdue_tasks command, which
+    # flags the tasks whose due date passed since their last save
+    overdue = models.BooleanField(default=False, editable=False)
+
+    tracked_fields = ('project_id', 'status', 'assignee_id', 'title', 'description')
+    OPEN_STATUSES = ('todo', 'in_progress')
+    # Most urgent first: high priority, then the longest overdue
+    URGENCY_ORDERING = [
+        models.Case(
+            models.When(priority='high', then=models.Value(0)),
+            models.When(priority='medium', then=models.Value(1)),
+            default=models.Value(2),
+            output_field=models.IntegerField(),
+        ).asc(),
+        models.F('due_date').asc(),
+        models.F('id').asc(),
+    ]
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination order of the task list
+            models.Index(fields=['-created_at', 'id'], name='task_created_id_idx'),
+            # Covers the per-project freshness check of the task lookup endpoint
+            models.Index(fields=['project', 'updated_at'], name='task_project_updated_idx'),
+            # Newest change across all tasks, for the task list ETag
+            models.Index(fields=['updated_at'], name='task_updated_idx'),
+            # Kanban columns: one project's tasks of one status in keyset order
+            models.Index(fields=['project', 'status', '-created_at', 'id'], name='task_board_idx'),
+            # Open tasks past their due date, for the overdue sweep
+            models.Index(fields=['status', 'due_date'], name='task_status_due_idx'),
+            # The (few) flagged tasks, per assignee for the overdue digests
+            models.Index(
+                fields=['assignee', 'due_date'],
+                condition=models.Q(overdue=True),
+                name='task_overdue_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.project.name}"
 
+    def save(self, *args, **kwargs):
+        self.overdue = self.compute_overdue()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'status', 'due_date'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'overdue'}
+        super().save(*args, **kwargs)
+
+    def compute_overdue(self, today=None):
+        if not self.due_date or self.status not in self.OPEN_STATUSES:
+            return False
+        return self.due_date < (today or timezone.now().date())
+
     @property
     def is_overdue(self):
-        if self.due_date and self.status != 'done':
-            return self.due_date < timezone.now().date()
-        return False
+        return self.overdue
 
 
-class WorkLog(models.Model):
+class WorkLog(TrackedFieldsMixin, models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='work_logs')
     task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='work_logs', null=True, blank=True)
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='work_logs')
@@ -101,13 +194,53 @@ class WorkLog(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    tracked_fields = ('user_id', 'project_id', 'task_id', 'date', 'hours_spent')
+
     class Meta:
         ordering = ['-date', '-created_at']
+        indexes = [
+            # Newest change per project, for the project page ETag
+            models.Index(fields=['project', 'updated_at'], name='worklog_project_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.date} - {self.project.name}"
 
 
+class TimesheetRollup(models.Model):
+    GRAIN_CHOICES = [
+        ('day', 'Day'),
+        ('week', 'Week'),
+        ('month', 'Month'),
+    ]
+
+    grain = models.CharField(max_length=5, choices=GRAIN_CHOICES)
+    period_start = models.DateField()
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='+')
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='+', null=True, blank=True)
+    hours = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    entries = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # COALESCE so that rows without a task are unique as well
+            models.UniqueConstraint(
+                models.F('grain'), models.F('period_start'), models.F('user'),
+                models.F('project'), Coalesce(models.F('task'), models.Value(0)),
+                name='unique_timesheet_rollup',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['grain', 'period_start'], name='rollup_grain_period_idx'),
+            models.Index(fields=['grain', 'user', 'period_start'], name='rollup_grain_user_idx'),
+            models.Index(fields=['grain', 'project', 'period_start'], name='rollup_grain_project_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_grain_display()} {self.period_start} - {self.user_id}/{self.project_id}: {self.hours}h"
+
+
 class TaskHistory(models.Model):
     ACTION_CHOICES = [
         ('created', 'Created'),
@@ -127,6 +260,49 @@ class TaskHistory(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Newest-first listings, and the age scan of the archiver
+            models.Index(fields=['-created_at', 'id'], name='history_created_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task.title} - {self.get_action_display()} by {self.user.username}"
+
+
+class ArchivedTaskHistory(models.Model):
+    # Task history older than TASK_HISTORY_RETENTION_DAYS, moved here by the
+    # archive_task_history command with its original id; read together with
+    # TaskHistory through core.history
+    id = models.BigIntegerField(primary_key=True)
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='archived_history')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    action = models.CharField(max_length=20, choices=TaskHistory.ACTION_CHOICES)
+    old_value = models.TextField(blank=True)
+    new_value = models.TextField(blank=True)
+    description = models.TextField(blank=True)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name_plural = 'archived task history'
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='archive_created_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task.title} - {self.get_action_display()} by {self.user.username}"
+
+
+class OverdueDigest(models.Model):
+    # Overdue tasks assigned to a user, rebuilt by the sweep_overdue_tasks command
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='overdue_digest')
+    total = models.IntegerField(default=0)
+    high_count = models.IntegerField(default=0)
+    medium_count = models.IntegerField(default=0)
+    low_count = models.IntegerField(default=0)
+    # The most urgent tasks: [{"id", "title", "project", "priority", "due_date"}, ...]
+    top_tasks = models.JSONField(default=list)
+    built_at = models.DateTimeField()
 
     def __str__(self):
-        return f"{self.task.title} - {self.get_action_display()} by {self.user.username}"
\ No newline at end of file
+        return f"{self.user.username}: {self.total} overdue"
@@ -0,0 +1,104 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from . import dashboard
+from .access import users_for_projects
+from .conditional import touch_projects
+from .models import OverdueDigest, Task
+
+# Task.save() keeps Task.overdue current for edited tasks, but tasks also
+# become overdue just by the date changing. sweep() flips the flags of those
+# tasks in bulk and build_digests() summarizes the flagged tasks per assignee;
+# the sweep_overdue_tasks command runs both and is meant to be scheduled
+# shortly after midnight.
+
+DIGEST_TOP_TASKS = 5
+
+
+def _due(today):
+    return Q(status__in=Task.OPEN_STATUSES, due_date__lt=today)
+
+
+def _set_flag(queryset, flag, batch_size):
+    rows = list(queryset.values_list('pk', 'assignee_id', 'project_id'))
+    for start in range(0, len(rows), batch_size):
+        ids = [pk for pk, _, _ in rows[start:start + batch_size]]
+        # The queryset's own condition is re-checked, so a task edited since
+        # it was read is left alone
+        queryset.filter(pk__in=ids).update(overdue=flag)
+    return rows
+
+
+def sweep(today=None, batch_size=1000):
+    """Bring every task's overdue flag up to date; return ``(flagged, cleared)``."""
+    today = today or timezone.now().date()
+    flagged = _set_flag(Task.objects.filter(_due(today), overdue=False), True, batch_size)
+    cleared = _set_flag(Task.objects.filter(overdue=True).exclude(_due(today)), False, batch_size)
+
+    changed = flagged + cleared
+    if changed:
+        project_ids = {project_id for _, _, project_id in changed}
+        # Nobody edited these tasks, so their updated_at stays; the project
+        # pages and cached fragments that show the flag go by the project
+        touch_projects(project_ids)
+        user_ids = {assignee_id for _, assignee_id, _ in changed}
+        dashboard.invalidate(user_ids | users_for_projects(project_ids))
+    return len(flagged), len(cleared)
+
+
+def build_digests():
+    """Rebuild the per-user overdue digests from the flags; return how many users have one."""
+    overdue = Task.objects.filter(overdue=True)
+    counts = overdue.order_by().values('assignee_id').annotate(
+        total=Count('pk'),
+        high_count=Count('pk', filter=Q(priority='high')),
+        medium_count=Count('pk', filter=Q(priority='medium')),
+        low_count=Count('pk', filter=Q(priority='low')),
+    )
+
+    # The most urgent tasks of every assignee in one query
+    ranked = overdue.annotate(
+        position=Window(RowNumber(), partition_by=[F('assignee_id')], order_by=Task.URGENCY_ORDERING),
+    ).filter(position__lte=DIGEST_TOP_TASKS).order_by('assignee_id', 'position').values(
+        'assignee_id', 'id', 'title', 'project__name', 'priority', 'due_date',
+    )
+    top_tasks = defaultdict(list)
+    for row in ranked:
+        top_tasks[row['assignee_id']].append({
+            'id': row['id'],
+            'title': row['title'],
+            'project': row['project__name'],
+            'priority': row['priority'],
+            'due_date': row['due_date'].isoformat(),
+        })
+
+    now = timezone.now()
+    digests = [
+        OverdueDigest(
+            user_id=row['assignee_id'],
+            total=row['total'],
+            high_count=row['high_count'],
+            medium_count=row['medium_count'],
+            low_count=row['low_count'],
+            top_tasks=top_tasks[row['assignee_id']],
+            built_at=now,
+        )
+        for row in counts
+    ]
+    user_ids = {digest.user_id for digest in digests}
+    with transaction.atomic():
+        stale = set(OverdueDigest.objects.exclude(user_id__in=user_ids).values_list('user_id', flat=True))
+        OverdueDigest.objects.filter(user_id__in=stale).delete()
+        OverdueDigest.objects.bulk_create(
+            digests,
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=['total', 'high_count', 'medium_count', 'low_count', 'top_tasks', 'built_at'],
+            batch_size=500,
+        )
+        dashboard.invalidate(user_ids | stale)
+    return len(digests)
@@ -0,0 +1,123 @@
+import base64
+from datetime import datetime
+from heapq import nsmallest
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+KEYSET_ORDERING = ('-created_at', 'id')
+
+
+class KeysetPage:
+    """One page of a queryset ordered by ``(-created_at, id)``."""
+
+    def __init__(self, items, next_cursor):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def encode_cursor(obj):
+    raw = f'{obj.created_at.isoformat()}|{obj.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return ``(created_at, pk)`` for a cursor, or ``None`` if it is invalid."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, pk = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(pk)
+    except (TypeError, ValueError, UnicodeDecodeError):
+        return None
+
+
+def keyset_paginate(queryset, cursor=None, page_size=50):
+    """Return the page of ``queryset`` that follows ``cursor``.
+
+    The cost of a page does not depend on how deep into the result set it is,
+    unlike OFFSET based pagination.
+    """
+    queryset = queryset.order_by(*KEYSET_ORDERING)
+    position = decode_cursor(cursor) if cursor else None
+    if position:
+        created_at, pk = position
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__gt=pk)
+        )
+
+    # Fetch one extra row to know whether there is a next page
+    items = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        next_cursor = encode_cursor(items[-1])
+    return KeysetPage(items, next_cursor)
+
+
+def _keyset_key(obj):
+    return (-obj.created_at.timestamp(), obj.pk)
+
+
+def keyset_paginate_many(querysets, cursor=None, page_size=50):
+    """Return one page across several querysets sharing the keyset order.
+
+    Each queryset contributes at most a page, so merging them costs no more
+    than paginating them separately.
+    """
+    pages = [keyset_paginate(queryset, cursor, page_size) for queryset in querysets]
+    candidates = [obj for page in pages for obj in page]
+    items = nsmallest(page_size, candidates, key=_keyset_key)
+    next_cursor = None
+    if items and (len(candidates) > page_size or any(page.has_next for page in pages)):
+        next_cursor = encode_cursor(items[-1])
+    return KeysetPage(items, next_cursor)
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination on the ``(-created_at, id)`` keyset.
+
+    Views may return a list of querysets to page through them as one. Every
+    page costs the same however deep a client is into the result set,
+    and no total count is computed. ``?page_size=`` is capped at
+    ``API_MAX_PAGE_SIZE``.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        cursor = request.query_params.get('cursor')
+        if cursor and decode_cursor(cursor) is None:
+            raise NotFound('Invalid cursor')
+        paginate = keyset_paginate_many if isinstance(queryset, list) else keyset_paginate
+        self.page = paginate(queryset, cursor=cursor, page_size=self.get_page_size(request))
+        return self.page.items
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get('page_size', settings.REST_FRAMEWORK['PAGE_SIZE']))
+        except ValueError:
+            raise ValidationError({'page_size': 'A positive integer is required.'})
+        if page_size < 1:
+            raise ValidationError({'page_size': 'A positive integer is required.'})
+        return min(page_size, settings.API_MAX_PAGE_SIZE)
+
+    def get_next_link(self):
+        if self.page.next_cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), 'cursor', self.page.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
@@ -0,0 +1,209 @@
+import calendar
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import TimesheetRollup, WorkLog
+from .signals import worklogs_bulk_created
+
+TRUNCATE = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+
+def period_start(grain, day):
+    if grain == 'week':
+        return day - timedelta(days=day.weekday())
+    if grain == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def period_end(grain, start):
+    if grain == 'week':
+        return start + timedelta(days=6)
+    if grain == 'month':
+        return start.replace(day=calendar.monthrange(start.year, start.month)[1])
+    return start
+
+
+def working_days(grain, start):
+    """Number of weekdays in the period starting at ``start``."""
+    end = period_end(grain, start)
+    days = (end - start).days + 1
+    full_weeks, rest = divmod(days, 7)
+    extra = sum(1 for offset in range(rest) if (start.weekday() + offset) % 7 < 5)
+    return full_weeks * 5 + extra
+
+
+def _normalize(values):
+    # Unsaved instances may still hold a datetime (the field default) or strings
+    return (
+        values['user_id'],
+        values['project_id'],
+        values['task_id'],
+        WorkLog._meta.get_field('date').to_python(values['date']),
+        WorkLog._meta.get_field('hours_spent').to_python(values['hours_spent']) or Decimal(0),
+    )
+
+
+def _instance_values(instance):
+    return {name: getattr(instance, name) for name in WorkLog.tracked_fields}
+
+
+def _add_delta(deltas, values, sign):
+    user_id, project_id, task_id, day, hours = _normalize(values)
+    delta = deltas[(user_id, project_id, task_id, day)]
+    delta[0] += sign * hours
+    delta[1] += sign
+
+
+def _new_deltas():
+    return defaultdict(lambda: [Decimal(0), 0])
+
+
+# Adds to the rollup row of a key, creating it if needed, in one statement per
+# row; the conflict target is the unique_timesheet_rollup index
+UPSERT_SQL = (
+    f'INSERT INTO {TimesheetRollup._meta.db_table} '
+    '(grain, period_start, user_id, project_id, task_id, hours, entries) '
+    'VALUES (%s, %s, %s, %s, %s, %s, %s) '
+    'ON CONFLICT (grain, period_start, user_id, project_id, COALESCE(task_id, 0)) '
+    'DO UPDATE SET hours = hours + excluded.hours, entries = entries + excluded.entries'
+)
+
+
+def apply_deltas(deltas):
+    """Apply ``{(user_id, project_id, task_id, date): [hours, entries]}`` to every grain."""
+    per_period = _new_deltas()
+    for (user_id, project_id, task_id, day), (hours, entries) in deltas.items():
+        for grain in TRUNCATE:
+            key = (grain, period_start(grain, day), user_id, project_id, task_id)
+            per_period[key][0] += hours
+            per_period[key][1] += entries
+
+    rows = [key + (hours, entries) for key, (hours, entries) in per_period.items() if hours or entries]
+    if not rows:
+        return
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.executemany(UPSERT_SQL, rows)
+        if any(entries < 0 for *_, entries in rows):
+            # Drop the periods whose last entry went away
+            TimesheetRollup.objects.filter(
+                period_start__in={row[1] for row in rows},
+                user_id__in={row[2] for row in rows},
+                entries__lte=0,
+            ).delete()
+
+
+def rebuild(batch_size=1000):
+    """Recompute every rollup row from the work log table."""
+    with transaction.atomic():
+        TimesheetRollup.objects.all().delete()
+        for grain, truncate in TRUNCATE.items():
+            rows = (
+                WorkLog.objects.order_by()
+                .annotate(period=truncate('date'))
+                .values('period', 'user_id', 'project_id', 'task_id')
+                .annotate(total_hours=Sum('hours_spent'), total_entries=Count('id'))
+            )
+            batch = []
+            for row in rows.iterator(chunk_size=batch_size):
+                batch.append(TimesheetRollup(
+                    grain=grain,
+                    period_start=row['period'],
+                    user_id=row['user_id'],
+                    project_id=row['project_id'],
+                    task_id=row['task_id'],
+                    hours=row['total_hours'] or 0,
+                    entries=row['total_entries'],
+                ))
+                if len(batch) >= batch_size:
+                    TimesheetRollup.objects.bulk_create(batch)
+                    batch = []
+            TimesheetRollup.objects.bulk_create(batch)
+
+
+# group_by name -> (id lookup, label lookup)
+GROUP_FIELDS = {
+    'user': ('user_id', 'user__username'),
+    'project': ('project_id', 'project__name'),
+    'task': ('task_id', 'task__title'),
+}
+
+
+def report(grain, start=None, end=None, group_by=('user', 'project'),
+           user_id=None, project_id=None, limit=5000):
+    """Sum hours per period and ``group_by`` columns from the rollup table.
+
+    When grouping by user, each row also carries the user's capacity for the
+    period and the share of it that was logged (``utilisation``).
+    """
+    rows = TimesheetRollup.objects.filter(grain=grain)
+    if start:
+        rows = rows.filter(period_start__gte=period_start(grain, start))
+    if end:
+        rows = rows.filter(period_start__lte=end)
+    if user_id:
+        rows = rows.filter(user_id=user_id)
+    if project_id:
+        rows = rows.filter(project_id=project_id)
+
+    fields = ['period_start']
+    for name in group_by:
+        fields.extend(GROUP_FIELDS[name])
+    rows = (
+        rows.values(*fields)
+        .annotate(hours=Sum('hours'), entries=Sum('entries'))
+        .order_by('period_start', *(GROUP_FIELDS[name][0] for name in group_by))
+    )
+
+    results = list(rows[:limit + 1])
+    truncated = len(results) > limit
+    results = results[:limit]
+    if 'user' in group_by:
+        for row in results:
+            capacity = working_days(grain, row['period_start']) * settings.WORKING_HOURS_PER_DAY
+            row['capacity_hours'] = capacity
+            row['utilisation'] = round(float(row['hours']) / capacity, 4) if capacity else None
+    return results, truncated
+
+
+@receiver(post_save, sender=WorkLog)
+def worklog_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    deltas = _new_deltas()
+    previous = getattr(instance, '_loaded_values', {})
+    if not created and set(WorkLog.tracked_fields) <= previous.keys():
+        _add_delta(deltas, previous, -1)
+    _add_delta(deltas, _instance_values(instance), 1)
+    apply_deltas(deltas)
+
+
+@receiver(post_delete, sender=WorkLog)
+def worklog_deleted(sender, instance, **kwargs):
+    previous = getattr(instance, '_loaded_values', {})
+    if not set(WorkLog.tracked_fields) <= previous.keys():
+        previous = _instance_values(instance)
+    deltas = _new_deltas()
+    _add_delta(deltas, previous, -1)
+    apply_deltas(deltas)
+
+
+@receiver(worklogs_bulk_created)
+def worklogs_bulk_created_rollups(sender, work_logs, **kwargs):
+    deltas = _new_deltas()
+    for work_log in work_logs:
+        _add_delta(deltas, _instance_values(work_log), 1)
+    apply_deltas(deltas)
@@ -0,0 +1,201 @@
+import re
+
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.urls import reverse
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Project, Task, WorkLog
+from .signals import tasks_bulk_created, worklogs_bulk_created
+
+TABLE = 'core_search_index'
+
+# The FTS rowid encodes both the kind and the primary key of the document
+# (pk * KIND_SLOTS + code), so a document can be replaced or removed through
+# the rowid index instead of scanning the table.
+KIND_SLOTS = 4
+KIND_CODES = {'task': 1, 'project': 2, 'worklog': 3}
+KINDS = {code: kind for kind, code in KIND_CODES.items()}
+
+CREATE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+    "project_id UNINDEXED, title, body, tokenize = 'porter unicode61 remove_diacritics 2')"
+)
+DROP_SQL = f'DROP TABLE IF EXISTS {TABLE}'
+
+# Column sources used by rebuild(): (kind, table, project id, title, body)
+SOURCES = [
+    ('task', Task, 'project_id', 'title', 'description'),
+    ('project', Project, 'id', 'name', 'description'),
+    ('worklog', WorkLog, 'project_id', "''", 'description'),
+]
+
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_END = '\x03'
+
+
+def is_available():
+    return connection.vendor == 'sqlite'
+
+
+def _rowid(kind, pk):
+    return pk * KIND_SLOTS + KIND_CODES[kind]
+
+
+def _document(kind, obj):
+    if kind == 'task':
+        return obj.project_id, obj.title, obj.description
+    if kind == 'project':
+        return obj.pk, obj.name, obj.description
+    return obj.project_id, '', obj.description
+
+
+def index_objects(kind, objects):
+    """Insert or replace the documents of ``objects``."""
+    if not is_available():
+        return
+    rows = [(_rowid(kind, obj.pk), *_document(kind, obj)) for obj in objects]
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {TABLE} WHERE rowid = %s', [(row[0],) for row in rows])
+        cursor.executemany(
+            f'INSERT INTO {TABLE} (rowid, project_id, title, body) VALUES (%s, %s, %s, %s)',
+            rows,
+        )
+
+
+def unindex_object(kind, pk):
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLE} WHERE rowid = %s', [_rowid(kind, pk)])
+
+
+def rebuild():
+    """Drop and recreate the index from the task, project and work log tables."""
+    with connection.cursor() as cursor:
+        cursor.execute(DROP_SQL)
+        cursor.execute(CREATE_SQL)
+        for kind, model, project_column, title_column, body_column in SOURCES:
+            cursor.execute(
+                f'INSERT INTO {TABLE} (rowid, project_id, title, body) '
+                f'SELECT id * {KIND_SLOTS} + {KIND_CODES[kind]}, {project_column}, '
+                f'{title_column}, {body_column} FROM {model._meta.db_table}'
+            )
+        cursor.execute(f"INSERT INTO {TABLE} ({TABLE}) VALUES ('optimize')")
+
+
+def build_match(query):
+    """Turn free text into an FTS5 query: every word must match, the last as a prefix."""
+    words = re.findall(r'\w+', query)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def _match(query, project_ids=None, kinds=None, limit=20, with_snippets=True):
+    match = build_match(query)
+    if match is None or not is_available():
+        return []
+    if project_ids is not None and not project_ids:
+        return []
+
+    columns = 'rowid, project_id, title'
+    params = []
+    if with_snippets:
+        columns += ', snippet({0}, -1, %s, %s, %s, 16)'.format(TABLE)
+        params += [HIGHLIGHT_START, HIGHLIGHT_END, '…']
+    sql = f'SELECT {columns} FROM {TABLE} WHERE {TABLE} MATCH %s'
+    params.append(match)
+    if project_ids is not None:
+        sql += f" AND project_id IN ({', '.join(['%s'] * len(project_ids))})"
+        params += list(project_ids)
+    if kinds:
+        codes = [KIND_CODES[kind] for kind in kinds]
+        sql += f" AND rowid %% {KIND_SLOTS} IN ({', '.join(['%s'] * len(codes))})"
+        params += codes
+    # Titles weigh more than bodies
+    sql += f' ORDER BY bm25({TABLE}, 0.0, 10.0, 1.0) LIMIT %s'
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def _highlight(text):
+    return mark_safe(
+        escape(text).replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_END, '</mark>')
+    )
+
+
+def search(query, project_ids=None, kinds=None, limit=20):
+    """Return ranked search results with highlighted snippets.
+
+    ``project_ids`` restricts the results to those projects (``None`` means
+    no restriction, for super admins).
+    """
+    results = []
+    for rowid, project_id, title, snippet in _match(query, project_ids, kinds, limit):
+        pk, code = divmod(rowid, KIND_SLOTS)
+        kind = KINDS[code]
+        results.append({
+            'kind': kind,
+            'id': pk,
+            'project_id': project_id,
+            'title': title,
+            'snippet': _highlight(snippet),
+            'url': reverse('project_detail', args=[project_id]),
+        })
+    return results
+
+
+def matching_pks(kind, query):
+    """Subquery of the primary keys of every ``kind`` document matching ``query``.
+
+    For ``pk__in`` filters, so the match runs inside the caller's query
+    without a limit; ``query`` must have a match (see build_match()).
+    """
+    return RawSQL(
+        f'SELECT rowid / {KIND_SLOTS} FROM {TABLE} WHERE {TABLE} MATCH %s AND rowid %% {KIND_SLOTS} = %s',
+        [build_match(query), KIND_CODES[kind]],
+    )
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=WorkLog)
+def document_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    kind = sender._meta.model_name
+    if kind == 'task' and not created:
+        # Status changes are by far the most common task save; skip those
+        previous = getattr(instance, '_loaded_values', {})
+        if all(previous.get(name) == getattr(instance, name)
+               for name in ('project_id', 'title', 'description')):
+            return
+    index_objects(kind, [instance])
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=WorkLog)
+def document_deleted(sender, instance, **kwargs):
+    unindex_object(sender._meta.model_name, instance.pk)
+
+
+@receiver(tasks_bulk_created)
+def tasks_bulk_indexed(sender, tasks, **kwargs):
+    index_objects('task', tasks)
+
+
+@receiver(worklogs_bulk_created)
+def worklogs_bulk_indexed(sender, work_logs, **kwargs):
+    index_objects('worklog', work_logs)
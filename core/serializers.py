@@ -0,0 +1,153 @@
+from django.db import transaction
+from rest_framework import serializers
+
+from .access import can_view_project
+from .models import Project, Task, TaskHistory, User, WorkLog
+from .services import create_tasks, create_work_logs
+
+
+def requested_fields(request):
+    """Return the field names asked for with ``?fields=``, or ``None`` for all.
+
+    Only reads are trimmed; writes always accept and return every field.
+    """
+    if request is None or request.method not in ('GET', 'HEAD'):
+        return None
+    value = request.query_params.get('fields')
+    if not value:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+class SparseFieldsMixin:
+    # Drop the fields a ``?fields=id,title`` request did not ask for
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        wanted = requested_fields(self.context.get('request'))
+        if wanted is not None:
+            for name in set(self.fields) - wanted:
+                self.fields.pop(name)
+
+
+class CachedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    # Bulk payloads repeat the same few projects and users; look each one up
+    # once per request instead of once per item
+    def to_internal_value(self, data):
+        cache = self.context.setdefault('related_objects', {})
+        key = (self.get_queryset().model, str(data))
+        if key not in cache:
+            cache[key] = super().to_internal_value(data)
+        return cache[key]
+
+
+def _check_project(serializer, project):
+    if not can_view_project(serializer.context['request'].user, project.pk):
+        raise serializers.ValidationError('Project not found')
+    return project
+
+
+class ProjectSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    members = CachedPrimaryKeyRelatedField(many=True, queryset=User.objects.all(), required=False)
+
+    class Meta:
+        model = Project
+        fields = (
+            'id', 'name', 'description', 'created_by', 'members', 'is_active',
+            'todo_count', 'in_progress_count', 'done_count', 'created_at', 'updated_at',
+        )
+        read_only_fields = ('created_by',)
+
+
+class TaskListSerializer(serializers.ListSerializer):
+    def create(self, validated_data):
+        return create_tasks([Task(**attrs) for attrs in validated_data])
+
+
+class TaskSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    project = CachedPrimaryKeyRelatedField(queryset=Project.objects.all())
+    assignee = CachedPrimaryKeyRelatedField(queryset=User.objects.all())
+
+    class Meta:
+        model = Task
+        fields = (
+            'id', 'title', 'description', 'project', 'assignee', 'created_by',
+            'status', 'priority', 'due_date', 'overdue', 'created_at', 'updated_at',
+        )
+        read_only_fields = ('created_by',)
+        list_serializer_class = TaskListSerializer
+
+    def validate_project(self, project):
+        return _check_project(self, project)
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            task = super().create(validated_data)
+            TaskHistory.objects.create(
+                task=task,
+                user=task.created_by,
+                action='created',
+                new_value=task.status,
+                description=f'Task "{task.title}" was created'
+            )
+        return task
+
+    def update(self, instance, validated_data):
+        old_status = instance.status
+        with transaction.atomic():
+            task = super().update(instance, validated_data)
+            if task.status != old_status:
+                TaskHistory.objects.create(
+                    task=task,
+                    user=self.context['request'].user,
+                    action='status_changed',
+                    old_value=old_status,
+                    new_value=task.status,
+                    description=f'Task status changed from {old_status} to {task.status}'
+                )
+            else:
+                TaskHistory.objects.create(
+                    task=task,
+                    user=self.context['request'].user,
+                    action='updated',
+                    description=f'Task "{task.title}" was updated'
+                )
+        return task
+
+
+class WorkLogListSerializer(serializers.ListSerializer):
+    def create(self, validated_data):
+        return create_work_logs([WorkLog(**attrs) for attrs in validated_data])
+
+
+class WorkLogSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    project = CachedPrimaryKeyRelatedField(queryset=Project.objects.all())
+    task = CachedPrimaryKeyRelatedField(
+        queryset=Task.objects.only('id', 'project_id'), required=False, allow_null=True,
+    )
+
+    class Meta:
+        model = WorkLog
+        fields = (
+            'id', 'user', 'project', 'task', 'description', 'hours_spent', 'date',
+            'created_at', 'updated_at',
+        )
+        read_only_fields = ('user',)
+        list_serializer_class = WorkLogListSerializer
+
+    def validate_project(self, project):
+        return _check_project(self, project)
+
+    def validate(self, attrs):
+        task = attrs.get('task')
+        if task is not None and task.project_id != attrs['project'].pk:
+            raise serializers.ValidationError({'task': 'Task does not belong to the project'})
+        return attrs
+
+
+class TaskHistorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = TaskHistory
+        fields = (
+            'id', 'task', 'user', 'action', 'old_value', 'new_value', 'description', 'created_at',
+        )
+        read_only_fields = fields
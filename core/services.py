@@ -0,0 +1,124 @@
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Task, TaskHistory, WorkLog
+from .signals import tasks_bulk_created, tasks_bulk_updated, worklogs_bulk_created
+
+VALID_STATUSES = dict(Task.STATUS_CHOICES)
+
+
+def bulk_change_status(user, changes):
+    """Apply a list of ``{'task_id': ..., 'status': ...}`` changes for ``user``.
+
+    Permissions are checked with one query, all tasks are updated with one
+    bulk UPDATE and all history rows are written with one bulk INSERT.
+    Returns one result dict per requested change, in the same order.
+    """
+    results = []
+    wanted = {}
+    for change in changes:
+        result = {'task_id': None, 'success': False}
+        results.append(result)
+        if not isinstance(change, dict):
+            result['error'] = 'Invalid change'
+            continue
+        try:
+            task_id = int(change.get('task_id'))
+        except (TypeError, ValueError):
+            result['error'] = 'Invalid task id'
+            continue
+        result['task_id'] = task_id
+        if change.get('status') not in VALID_STATUSES:
+            result['error'] = 'Invalid status'
+            continue
+        # A later change for the same task wins
+        wanted[task_id] = (change['status'], result)
+
+    with transaction.atomic():
+        # The statuses are read in the transaction that writes the changes (with
+        # the IMMEDIATE transaction mode it holds the write lock from the start),
+        # so a concurrent change cannot land in between and skew the counters
+        tasks = Task.objects.select_for_update().only(
+            'id', 'project_id', 'assignee_id', 'status', 'due_date',
+        ).in_bulk(wanted)
+
+        changed = []
+        previous = {}
+        history = []
+        now = timezone.now()
+        for task_id, (new_status, result) in wanted.items():
+            task = tasks.get(task_id)
+            if task is None:
+                result['error'] = 'Task not found'
+                continue
+            if not user.is_super_admin and task.assignee_id != user.pk:
+                result['error'] = 'Permission denied'
+                continue
+
+            result['success'] = True
+            old_status = task.status
+            if old_status == new_status:
+                continue
+
+            previous[task.pk] = dict(task._loaded_values)
+            task.status = new_status
+            task.updated_at = now
+            task.overdue = task.compute_overdue(now.date())
+            changed.append(task)
+            history.append(TaskHistory(
+                task=task,
+                user=user,
+                action='status_changed',
+                old_value=old_status,
+                new_value=new_status,
+                description=f'Task status changed from {old_status} to {new_status}'
+            ))
+
+        if changed:
+            Task.objects.bulk_update(changed, ['status', 'updated_at', 'overdue'], batch_size=500)
+            TaskHistory.objects.bulk_create(history, batch_size=500)
+            tasks_bulk_updated.send(sender=Task, tasks=changed, previous=previous)
+
+    # Results of superseded duplicates mirror the change that was applied
+    for change_result in results:
+        applied = wanted.get(change_result['task_id'])
+        if applied and applied[1] is not change_result and 'error' not in change_result:
+            change_result.update(applied[1])
+
+    for task in changed:
+        task.remember_loaded_values()
+
+    return results
+
+
+def create_tasks(tasks):
+    """Insert new ``tasks`` with their "created" history rows using bulk INSERTs."""
+    for task in tasks:
+        # bulk_create() skips Task.save()
+        task.overdue = task.compute_overdue()
+    with transaction.atomic():
+        Task.objects.bulk_create(tasks, batch_size=500)
+        TaskHistory.objects.bulk_create([
+            TaskHistory(
+                task=task,
+                user_id=task.created_by_id,
+                action='created',
+                new_value=task.status,
+                description=f'Task "{task.title}" was created'
+            )
+            for task in tasks
+        ], batch_size=500)
+        tasks_bulk_created.send(sender=Task, tasks=tasks)
+    for task in tasks:
+        task.remember_loaded_values()
+    return tasks
+
+
+def create_work_logs(work_logs):
+    """Insert new ``work_logs`` using bulk INSERTs."""
+    with transaction.atomic():
+        WorkLog.objects.bulk_create(work_logs, batch_size=500)
+        worklogs_bulk_created.send(sender=WorkLog, work_logs=work_logs)
+    for work_log in work_logs:
+        work_log.remember_loaded_values()
+    return work_logs
@@ -0,0 +1,13 @@
+from django.dispatch import Signal
+
+# Sent after tasks were inserted with bulk_create(), which skips post_save.
+# Arguments: ``tasks``.
+tasks_bulk_created = Signal()
+
+# Sent after tasks were changed with bulk_update()/update(), which skip
+# post_save. Arguments: ``tasks`` and ``previous``, a dict mapping each task
+# pk to its tracked field values from before the change.
+tasks_bulk_updated = Signal()
+
+# Sent after work logs were inserted with bulk_create(). Arguments: ``work_logs``.
+worklogs_bulk_created = Signal()
@@ -0,0 +1,19 @@
+from django import template
+from django.utils.html import format_html
+
+from core.assets import PLAY_CDN, bundle_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def css_bundle():
+    """Link the built CSS bundle.
+
+    Falls back to the Tailwind Play CDN script until ``manage.py build_assets``
+    has been run, so a fresh checkout still renders styled pages.
+    """
+    url = bundle_url()
+    if url is None:
+        return format_html('<script src="{}"></script>', PLAY_CDN)
+    return format_html('<link rel="stylesheet" href="{}">', url)
@@ -0,0 +1,48 @@
+from django import template
+
+from core.fragments import get_or_render
+
+register = template.Library()
+
+
+class FragmentNode(template.Node):
+    def __init__(self, nodelist, name, project, vary):
+        self.nodelist = nodelist
+        self.name = name
+        self.project = project
+        self.vary = vary
+
+    def render(self, context):
+        name = self.name.resolve(context)
+        project = self.project.resolve(context)
+        vary = tuple(value.resolve(context) for value in self.vary)
+        return get_or_render(name, project, lambda: self.nodelist.render(context), vary)
+
+
+@register.tag
+def fragment(parser, token):
+    """Cache the enclosed template under the version of a project.
+
+    Usage::
+
+        {% load fragments %}
+        {% fragment "project_card" project [vary_on ...] %}
+            ...
+        {% endfragment %}
+
+    The fragment is shared by every viewer, so it must not contain per-user
+    markup (or that markup must be passed as additional ``vary_on`` values).
+    """
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' tag requires a fragment name and a project."
+        )
+    nodelist = parser.parse(('endfragment',))
+    parser.delete_first_token()
+    return FragmentNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        parser.compile_filter(bits[2]),
+        [parser.compile_filter(bit) for bit in bits[3:]],
+    )
@@ -0,0 +1,42 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from . import analytics
+from .models import Project, Task, User
+from .services import create_tasks
+
+
+class ProjectAnalyticsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner', password='secret')
+        self.project = Project.objects.create(name='Imported', created_by=self.user)
+
+    def test_task_created_done_counts_as_completed(self):
+        create_tasks([
+            Task(title=title, status=status, project=self.project,
+                 assignee=self.user, created_by=self.user)
+            for title, status in [('Finished', 'done'), ('Open', 'todo')]
+        ])
+
+        report = analytics.project_report(self.project.pk)
+
+        self.assertEqual(report['burndown']['opened'], [2])
+        self.assertEqual(report['burndown']['completed'], [1])
+        self.assertEqual(report['burndown']['remaining'], [1])
+        self.assertEqual(report['cycle_time']['completed'], 1)
+        self.assertEqual(report['cycle_time']['median_days'], 0)
+        self.assertEqual(report['velocity'][0]['total'], 1)
+
+    def test_deleting_task_drops_state_again_on_commit(self):
+        task, = create_tasks([
+            Task(title='Gone', project=self.project, assignee=self.user, created_by=self.user)
+        ])
+        analytics.project_report(self.project.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task.delete()
+            # Rebuilt by a concurrent request before the delete commits
+            cache.set(analytics._cache_key(self.project.pk), analytics._new_state())
+
+        self.assertIsNone(cache.get(analytics._cache_key(self.project.pk)))
@@ -5,10 +5,22 @@ urlpatterns = [
     path('', views.dashboard, name='dashboard'),
     path('projects/', views.project_list, name='project_list'),
     path('projects/<int:pk>/', views.project_detail, name='project_detail'),
+    path('projects/<int:pk>/board/<str:status>/', views.project_board_column, name='project_board_column'),
     path('projects/create/', views.project_create, name='project_create'),
     path('tasks/', views.task_list, name='task_list'),
     path('tasks/create/', views.task_create, name='task_create'),
     path('worklogs/', views.worklog_list, name='worklog_list'),
     path('worklogs/create/', views.worklog_create, name='worklog_create'),
+    path('exports/worklogs/', views.export_worklogs, name='export_worklogs'),
+    path('exports/task-history/', views.export_task_history, name='export_task_history'),
+    path('search/', views.search, name='search'),
+    path('imports/', views.import_data, name='import_data'),
+    path('reports/timesheet/', views.timesheet_report, name='timesheet_report'),
+    path('metrics/', views.metrics, name='metrics'),
+    path('live/events/', views.live_events, name='live_events'),
+    path('live/poll/', views.live_poll, name='live_poll'),
     path('api/update-task-status/', views.update_task_status, name='update_task_status'),
+    path('api/bulk-update-task-status/', views.bulk_update_task_status, name='bulk_update_task_status'),
+    path('api/projects/<int:pk>/tasks/', views.project_tasks, name='project_tasks'),
+    path('api/projects/<int:pk>/analytics/', views.project_analytics, name='project_analytics'),
 ]
\ No newline at end of file
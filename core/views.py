@@ -1,13 +1,35 @@
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
+from django.template.loader import render_to_string
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q, Count
+from django.db.models import Q, Count, Max
 from django.utils import timezone
 from .models import User, Project, Task, WorkLog, TaskHistory
-from .forms import CustomUserCreationForm, ProjectForm, TaskForm, WorkLogForm
+from .forms import CustomUserCreationForm, ImportForm, ProjectForm, TaskForm, WorkLogForm
+from . import analytics, exports, history, imports, kanban, live, rollups
+from . import search as search_index
+from .access import can_view_project, visible_project_ids
+from .conditional import project_detail_etag, project_list_etag, task_list_etag
+from .dashboard import get_snapshot
+from .db_routers import reporting_view
+from .metrics import registry as metrics_registry
+from .pagination import keyset_paginate
+from .services import bulk_change_status
+import io
 import json
-from django.http import JsonResponse
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import (
+    HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, JsonResponse,
+    StreamingHttpResponse,
+)
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_date
+from django.utils.http import http_date
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_safe
 
 def register(request):
     if request.method == 'POST':
@@ -23,53 +45,14 @@ def register(request):
 
 @login_required
 def dashboard(request):
-    user = request.user
-    
-    # Get user's projects
-    if user.is_super_admin:
-        projects = Project.objects.filter(is_active=True)
-        tasks = Task.objects.all()
-        work_logs = WorkLog.objects.all()
-    else:
-        projects = Project.objects.filter(
-            Q(members=user) | Q(created_by=user),
-            is_active=True
-        ).distinct()
-        tasks = Task.objects.filter(Q(assignee=user) | Q(project__in=projects))
-        work_logs = WorkLog.objects.filter(user=user)
-    
-    # Get recent tasks
-    recent_tasks = tasks.order_by('-updated_at')[:5]
-    
-    # Get today's work logs
-    today_logs = work_logs.filter(date=timezone.now().date())
-    
-    # Get task statistics
-    task_stats = {
-        'total': tasks.count(),
-        'todo': tasks.filter(status='todo').count(),
-        'in_progress': tasks.filter(status='in_progress').count(),
-        'done': tasks.filter(status='done').count(),
-    }
-    
-    # Get overdue tasks
-    overdue_tasks = tasks.filter(
-        due_date__lt=timezone.now().date(),
-        status__in=['todo', 'in_progress']
-    )[:5]
-    
-    context = {
-        'projects': projects[:5],  # Show only 5 recent projects
-        'recent_tasks': recent_tasks,
-        'today_logs': today_logs,
-        'task_stats': task_stats,
-        'overdue_tasks': overdue_tasks,
-        'total_projects': projects.count(),
-    }
+    # Stats, recent tasks and today's logs come from a cached per-user snapshot
+    context = get_snapshot(request.user)
     
     return render(request, 'core/dashboard.html', context)
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=project_list_etag)
 def project_list(request):
     user = request.user
     
@@ -77,29 +60,33 @@ def project_list(request):
         projects = Project.objects.filter(is_active=True)
     else:
         projects = Project.objects.filter(
-            Q(members=user) | Q(created_by=user),
+            pk__in=visible_project_ids(user),
             is_active=True
-        ).distinct()
+        )
     
     return render(request, 'core/project_list.html', {'projects': projects})
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=project_detail_etag)
 def project_detail(request, pk):
-    project = get_object_or_404(Project, pk=pk)
+    project = get_object_or_404(Project.objects.select_related('created_by'), pk=pk)
     
     # Check if user has access to this project
-    if not request.user.is_super_admin:
-        if request.user not in project.members.all() and project.created_by != request.user:
-            messages.error(request, 'You do not have access to this project.')
-            return redirect('project_list')
+    if not can_view_project(request.user, project.pk):
+        messages.error(request, 'You do not have access to this project.')
+        return redirect('project_list')
     
-    tasks = project.tasks.all()
-    recent_logs = project.work_logs.all()[:10]
+    # Columns load their first cards in one query, only on a fragment cache miss
+    board = kanban.Board(project, settings.KANBAN_COLUMN_SIZE)
+    recent_logs = project.work_logs.select_related('user')[:10]
     
     context = {
         'project': project,
-        'tasks': tasks,
+        'board': board,
         'recent_logs': recent_logs,
+        # Live updates start after the newest change this page shows
+        'live_cursor': live.latest_id(),
     }
     
     return render(request, 'core/project_detail.html', context)
@@ -121,22 +108,23 @@ def project_create(request):
     return render(request, 'core/project_form.html', {'form': form, 'title': 'Create Project'})
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=task_list_etag)
 def task_list(request):
     user = request.user
     
     if user.is_super_admin:
         tasks = Task.objects.all()
     else:
-        user_projects = Project.objects.filter(
-            Q(members=user) | Q(created_by=user)
-        ).distinct()
         tasks = Task.objects.filter(
-            Q(assignee=user) | Q(project__in=user_projects)
+            Q(assignee=user) | Q(project_id__in=visible_project_ids(user))
         )
     
-    # Filter by status if provided
+    # Filter by status if provided; "overdue" reads the precomputed flag
     status = request.GET.get('status')
-    if status:
+    if status == 'overdue':
+        tasks = tasks.filter(overdue=True)
+    elif status:
         tasks = tasks.filter(status=status)
     
     # Filter by project if provided
@@ -144,7 +132,14 @@ def task_list(request):
     if project_id:
         tasks = tasks.filter(project_id=project_id)
     
-    return render(request, 'core/task_list.html', {'tasks': tasks})
+    # Keyset pagination; project and assignee are joined into the same query
+    page = keyset_paginate(
+        tasks.select_related('project', 'assignee'),
+        cursor=request.GET.get('cursor'),
+        page_size=settings.TASK_LIST_PAGE_SIZE,
+    )
+    
+    return render(request, 'core/task_list.html', {'tasks': page.items, 'page': page})
 
 @login_required
 def task_create(request):
@@ -160,6 +155,7 @@ def task_create(request):
                 task=task,
                 user=request.user,
                 action='created',
+                new_value=task.status,
                 description=f'Task "{task.title}" was created'
             )
             
@@ -208,6 +204,9 @@ def update_task_status(request):
         task_id = data.get('task_id')
         new_status = data.get('status')
         
+        if new_status not in dict(Task.STATUS_CHOICES):
+            return JsonResponse({'success': False, 'error': 'Invalid status'})
+        
         try:
             task = Task.objects.get(pk=task_id)
             
@@ -233,4 +232,306 @@ def update_task_status(request):
         except Task.DoesNotExist:
             return JsonResponse({'success': False, 'error': 'Task not found'})
     
-    return JsonResponse({'success': False, 'error': 'Invalid request'})
\ No newline at end of file
+    return JsonResponse({'success': False, 'error': 'Invalid request'})
+
+@login_required
+def bulk_update_task_status(request):
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Invalid request'})
+    
+    try:
+        changes = json.loads(request.body).get('changes')
+    except (ValueError, AttributeError):
+        changes = None
+    if not isinstance(changes, list):
+        return JsonResponse({'success': False, 'error': 'Invalid request'})
+    if len(changes) > settings.BULK_STATUS_MAX_CHANGES:
+        return JsonResponse({
+            'success': False,
+            'error': f'At most {settings.BULK_STATUS_MAX_CHANGES} changes per request'
+        })
+    
+    results = bulk_change_status(request.user, changes)
+    return JsonResponse({
+        'success': all(result['success'] for result in results),
+        'results': results,
+    })
+
+
+@login_required
+@require_safe
+def project_tasks(request, pk):
+    if not can_view_project(request.user, pk):
+        return JsonResponse({'success': False, 'error': 'Project not found'}, status=404)
+    
+    tasks = Task.objects.filter(project_id=pk)
+    # Deletions lower the count; every other change moves the newest updated_at
+    state = tasks.order_by().aggregate(count=Count('id'), last_modified=Max('updated_at'))
+    last_modified = state['last_modified']
+    etag = f'"project-{pk}-tasks-{state["count"]}-{last_modified.timestamp() if last_modified else 0}"'
+    last_modified_ts = int(last_modified.timestamp()) if last_modified else None
+    
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified_ts)
+    if response is None:
+        rows = tasks.order_by('title', 'id').values('id', 'title', 'status')
+        response = JsonResponse({'success': True, 'project_id': pk, 'tasks': list(rows)})
+    response.headers['ETag'] = etag
+    if last_modified_ts:
+        response.headers['Last-Modified'] = http_date(last_modified_ts)
+    # Browsers may keep the list but must revalidate it on every use
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+@login_required
+@require_safe
+def project_board_column(request, pk, status):
+    if not can_view_project(request.user, pk):
+        return JsonResponse({'success': False, 'error': 'Project not found'}, status=404)
+    if status not in dict(Task.STATUS_CHOICES):
+        return JsonResponse({'success': False, 'error': 'Invalid status'}, status=400)
+    
+    page = keyset_paginate(
+        kanban.card_queryset(pk).filter(status=status),
+        cursor=request.GET.get('cursor'),
+        page_size=settings.KANBAN_COLUMN_SIZE,
+    )
+    html = ''.join(
+        render_to_string('core/partials/task_card.html', {'task': task}, request=request)
+        for task in page
+    )
+    return JsonResponse({'success': True, 'html': html, 'next_cursor': page.next_cursor})
+
+def _live_params(request):
+    try:
+        project_id = int(request.GET['project']) if request.GET.get('project') else None
+        # EventSource sends the id of the last event it saw when reconnecting
+        after = request.headers.get('Last-Event-ID') or request.GET.get('after')
+        after = int(after) if after else None
+    except ValueError:
+        return None
+    return project_id, after
+
+@login_required
+async def live_events(request):
+    # A stream would hold a WSGI worker forever; EventSource gives up on 204
+    # and the board falls back to polling live_poll
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+    params = _live_params(request)
+    if params is None:
+        return HttpResponseBadRequest('Invalid parameters')
+    project_id, after = params
+    user = await request.auser()
+    if project_id is not None and not await sync_to_async(can_view_project)(user, project_id):
+        return JsonResponse({'success': False, 'error': 'Project not found'}, status=404)
+    
+    response = StreamingHttpResponse(
+        live.stream(user, project_id, after),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    # Tell nginx not to buffer the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+@login_required
+async def live_poll(request):
+    params = _live_params(request)
+    if params is None:
+        return JsonResponse({'success': False, 'error': 'Invalid parameters'}, status=400)
+    project_id, after = params
+    user = await request.auser()
+    if project_id is not None and not await sync_to_async(can_view_project)(user, project_id):
+        return JsonResponse({'success': False, 'error': 'Project not found'}, status=404)
+    
+    # Under ASGI the request waits for the next change; under WSGI it answers
+    # at once and the client polls again after "retry" milliseconds
+    if isinstance(request, ASGIRequest):
+        timeout, retry = settings.LIVE_LONG_POLL_TIMEOUT, 0
+    else:
+        timeout, retry = 0, settings.LIVE_SHORT_POLL_INTERVAL * 1000
+    
+    if after is None:
+        events, cursor = [], await sync_to_async(live.latest_id)()
+    else:
+        events, cursor = await live.wait_for_events(user, project_id, after, timeout)
+    return JsonResponse({
+        'success': True,
+        'events': events or [],
+        'cursor': cursor,
+        'reset': events is None,
+        'retry': retry,
+    })
+
+def _export_params(request):
+    fmt = request.GET.get('format', 'csv')
+    start = request.GET.get('start')
+    end = request.GET.get('end')
+    project_id = request.GET.get('project')
+    try:
+        start_date = parse_date(start) if start else None
+        end_date = parse_date(end) if end else None
+        project_id = int(project_id) if project_id else None
+    except ValueError:
+        return None
+    if (start and not start_date) or (end and not end_date) or fmt not in exports.FORMATS:
+        return None
+    return fmt, start_date, end_date, project_id
+
+
+def _export_response(rows, columns, fmt, filename):
+    response = StreamingHttpResponse(
+        exports.render(rows, columns, fmt),
+        content_type=exports.FORMATS[fmt],
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{fmt}"'
+    return response
+
+@login_required
+@reporting_view
+def export_worklogs(request):
+    params = _export_params(request)
+    if params is None:
+        return HttpResponseBadRequest('Invalid export parameters')
+    fmt, start, end, project_id = params
+    
+    work_logs = exports.worklog_queryset(start, end, project_id)
+    if not request.user.is_super_admin:
+        work_logs = work_logs.filter(user=request.user)
+    
+    rows = exports.iter_rows(work_logs, exports.WORKLOG_COLUMNS)
+    return _export_response(rows, exports.WORKLOG_COLUMNS, fmt, 'worklogs')
+
+@login_required
+@reporting_view
+def export_task_history(request):
+    params = _export_params(request)
+    if params is None:
+        return HttpResponseBadRequest('Invalid export parameters')
+    fmt, start, end, project_id = params
+    
+    # Recent and archived history
+    querysets = [exports.history_queryset(start, end, project_id, model) for model in history.STORES]
+    if not request.user.is_super_admin:
+        project_ids = visible_project_ids(request.user)
+        querysets = [queryset.filter(task__project_id__in=project_ids) for queryset in querysets]
+    
+    rows = exports.iter_merged_rows(querysets, exports.HISTORY_COLUMNS)
+    return _export_response(rows, exports.HISTORY_COLUMNS, fmt, 'task_history')
+
+@login_required
+@reporting_view
+def timesheet_report(request):
+    grain = request.GET.get('grain', 'week')
+    group_by = [name for name in request.GET.get('group_by', 'user,project').split(',') if name]
+    start = request.GET.get('start')
+    end = request.GET.get('end')
+    try:
+        start_date = parse_date(start) if start else None
+        end_date = parse_date(end) if end else None
+        user_id = int(request.GET['user']) if request.GET.get('user') else None
+        project_id = int(request.GET['project']) if request.GET.get('project') else None
+    except ValueError:
+        return HttpResponseBadRequest('Invalid report parameters')
+    if (
+        grain not in rollups.TRUNCATE
+        or any(name not in rollups.GROUP_FIELDS for name in group_by)
+        or (start and not start_date) or (end and not end_date)
+    ):
+        return HttpResponseBadRequest('Invalid report parameters')
+    
+    # Developers only see their own time
+    if not request.user.is_super_admin:
+        user_id = request.user.pk
+    
+    rows, truncated = rollups.report(
+        grain, start_date, end_date, group_by,
+        user_id=user_id, project_id=project_id,
+        limit=settings.REPORT_MAX_ROWS,
+    )
+    return JsonResponse({
+        'grain': grain,
+        'group_by': group_by,
+        'truncated': truncated,
+        'rows': rows,
+    })
+
+@login_required
+@require_safe
+@reporting_view
+def project_analytics(request, pk):
+    if not can_view_project(request.user, pk):
+        return JsonResponse({'success': False, 'error': 'Project not found'}, status=404)
+    start = request.GET.get('start')
+    end = request.GET.get('end')
+    try:
+        start_date = parse_date(start) if start else None
+        end_date = parse_date(end) if end else None
+    except ValueError:
+        return HttpResponseBadRequest('Invalid report parameters')
+    if (start and not start_date) or (end and not end_date) or (
+        start_date and end_date and start_date > end_date
+    ):
+        return HttpResponseBadRequest('Invalid report parameters')
+    
+    report = analytics.project_report(pk, start_date, end_date)
+    return JsonResponse({'success': True, 'project_id': pk, **report})
+
+@login_required
+def search(request):
+    query = request.GET.get('q', '').strip()
+    kind = request.GET.get('kind')
+    
+    results = []
+    if query:
+        project_ids = None if request.user.is_super_admin else visible_project_ids(request.user)
+        results = search_index.search(
+            query,
+            project_ids=project_ids,
+            kinds=[kind] if kind in search_index.KIND_CODES else None,
+            limit=settings.SEARCH_RESULTS_LIMIT,
+        )
+    
+    return render(request, 'core/search.html', {'query': query, 'kind': kind, 'results': results})
+
+@login_required
+def import_data(request):
+    if not request.user.is_super_admin:
+        return HttpResponseForbidden('Permission denied')
+    
+    result = None
+    if request.method == 'POST':
+        form = ImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            file = io.TextIOWrapper(form.cleaned_data['file'].file, encoding='utf-8-sig', newline='')
+            try:
+                result = imports.import_csv(
+                    form.cleaned_data['kind'], file, request.user,
+                    batch_size=settings.IMPORT_BATCH_SIZE,
+                    dry_run=form.cleaned_data['dry_run'],
+                    atomic=form.cleaned_data['atomic'],
+                )
+            except imports.ImportFileError as exc:
+                form.add_error('file', str(exc))
+    else:
+        form = ImportForm()
+    
+    return render(request, 'core/import.html', {
+        'form': form,
+        'result': result,
+        'errors': result.errors[:settings.IMPORT_MAX_REPORTED_ERRORS] if result else [],
+        'formats': [
+            (label, imports.IMPORTERS[kind].columns, imports.IMPORTERS[kind].required)
+            for kind, label in imports.KIND_CHOICES
+        ],
+    })
+
+@login_required
+def metrics(request):
+    if not request.user.is_super_admin:
+        return HttpResponseForbidden('Permission denied')
+    
+    return HttpResponse(
+        metrics_registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
\ No newline at end of file
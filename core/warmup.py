@@ -0,0 +1,101 @@
+import logging
+from pathlib import Path
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+from django.template import TemplateSyntaxError, engines
+from django.urls import URLResolver, get_resolver
+
+from . import authcache
+from .access import visible_project_ids
+from .models import User
+
+logger = logging.getLogger('core.warmup')
+
+# Work the first request after a cold start would otherwise do on demand:
+# importing every URLconf and view module, compiling URL patterns, and
+# loading and parsing templates. Templates land in the cached template loader
+# (Django's default loader setup), so each is compiled once per process.
+
+TEMPLATE_SUFFIXES = ('.html', '.txt')
+
+
+def _compile_patterns(resolver):
+    count = 0
+    # url_patterns imports the URLconf module, and with it the views
+    for pattern in resolver.url_patterns:
+        # Compiled on first access, then cached per language
+        pattern.pattern.regex
+        count += 1
+        if isinstance(pattern, URLResolver):
+            count += _compile_patterns(pattern)
+            # Namespaced resolvers (admin) build their reverse tables lazily
+            pattern.reverse_dict
+    return count
+
+
+def warm_urls():
+    """Import every URLconf and compile its patterns and reverse tables."""
+    resolver = get_resolver()
+    count = _compile_patterns(resolver)
+    resolver.reverse_dict
+    return count
+
+
+def warm_templates():
+    """Load and compile every template the engines can find."""
+    count = 0
+    for engine in engines.all():
+        for directory in engine.template_dirs:
+            directory = Path(directory)
+            for path in sorted(directory.rglob('*')):
+                if path.suffix not in TEMPLATE_SUFFIXES or not path.is_file():
+                    continue
+                try:
+                    engine.get_template(path.relative_to(directory).as_posix())
+                except (TemplateSyntaxError, UnicodeDecodeError) as exc:
+                    # Only rendered with context this one does not have
+                    logger.debug('Skipped template %s: %s', path, exc)
+                    continue
+                count += 1
+    return count
+
+
+def warm_database():
+    """Open the database connections and fill the caches of recently active users."""
+    for connection in connections.all():
+        connection.ensure_connection()
+    users = User.objects.filter(is_active=True, last_login__isnull=False).order_by('-last_login')
+    count = 0
+    for user in users[:settings.WARMUP_USERS]:
+        authcache.remember(user)
+        visible_project_ids(user)
+        count += 1
+    return count
+
+
+PHASES = [
+    ('urls', warm_urls),
+    ('templates', warm_templates),
+    ('database', warm_database),
+]
+
+
+def run(database=None):
+    """Run the warm-up phases and return ``[(phase, seconds, count)]``.
+
+    ``database`` defaults to ``WARMUP_DATABASE``.
+    """
+    if database is None:
+        database = settings.WARMUP_DATABASE
+    timings = []
+    for name, phase in PHASES:
+        if name == 'database' and not database:
+            continue
+        start = perf_counter()
+        count = phase()
+        elapsed = perf_counter() - start
+        timings.append((name, elapsed, count))
+        logger.info('Warm-up %s: %d in %.1fms', name, count, elapsed * 1000)
+    return timings
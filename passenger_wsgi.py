@@ -10,3 +10,9 @@ os.environ['DJANGO_SETTINGS_MODULE'] = 'settings'
 # WSGI application
 from django.core.wsgi import get_wsgi_application
 application = get_wsgi_application()
+
+# Pay the first request's import and compile costs before serving
+from django.conf import settings
+if settings.WARMUP_ON_STARTUP:
+    from core import warmup
+    warmup.run()
@@ -36,10 +36,12 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.StaticAssetMiddleware',
+    'core.middleware.RequestMetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -64,6 +66,19 @@ TEMPLATES = [
 
 
 WSGI_APPLICATION = 'projectmanager.wsgi.application'
+# Serve with an ASGI server (e.g. uvicorn projectmanager.asgi:application) for
+# the live board stream; under WSGI boards fall back to polling
+ASGI_APPLICATION = 'projectmanager.asgi.application'
+
+# Cold-start warm-up (see core/warmup.py): the WSGI entry points import the
+# URLconfs and compile the URL patterns and templates before serving. With
+# WARMUP_DATABASE they also open the database connections and fill the user
+# and access caches of the WARMUP_USERS most recently active users; leave it
+# off when the server forks workers after loading the application
+# (gunicorn --preload), as connections must not be shared across processes.
+WARMUP_ON_STARTUP = config('WARMUP_ON_STARTUP', default=False, cast=bool)
+WARMUP_DATABASE = config('WARMUP_DATABASE', default=False, cast=bool)
+WARMUP_USERS = config('WARMUP_USERS', default=100, cast=int)
 
 # Database
 DATABASES = {
@@ -73,6 +88,146 @@ DATABASES = {
     }
 }
 
+# Tuned SQLite profile: WAL journaling, connection pragmas, persistent
+# connections, and a read-only "reporting" connection used by the reporting
+# and export views (see core/db_routers.py).
+SQLITE_TUNED = config('SQLITE_TUNED', default=False, cast=bool)
+
+if SQLITE_TUNED:
+    SQLITE_PRAGMAS = (
+        'PRAGMA synchronous = NORMAL;'
+        f"PRAGMA cache_size = -{config('SQLITE_CACHE_KB', default=65536, cast=int)};"
+        f"PRAGMA mmap_size = {config('SQLITE_MMAP_BYTES', default=268435456, cast=int)};"
+        f"PRAGMA busy_timeout = {config('SQLITE_BUSY_TIMEOUT_MS', default=5000, cast=int)};"
+        'PRAGMA temp_store = MEMORY;'
+    )
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=600, cast=int),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # journal_mode is stored in the database file; the rest is per connection
+            'init_command': 'PRAGMA journal_mode = WAL;' + SQLITE_PRAGMAS,
+            # Take the write lock when a transaction starts instead of failing
+            # with "database is locked" when a reader upgrades mid-transaction
+            'transaction_mode': 'IMMEDIATE',
+        },
+    })
+    DATABASES['reporting'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': f"file:{DATABASES['default']['NAME']}?mode=ro",
+        'CONN_MAX_AGE': DATABASES['default']['CONN_MAX_AGE'],
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': SQLITE_PRAGMAS + 'PRAGMA query_only = ON;',
+        },
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.db_routers.ReportingRouter']
+
+# Cache
+# LocMemCache is per process; point CACHE_BACKEND/CACHE_LOCATION at a shared
+# backend (file, memcached, redis) when running several workers.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='projectmanager'),
+    },
+    # Rendered project cards and kanban columns (see core/fragments.py).
+    # LocMemCache evicts least recently used entries once MAX_ENTRIES is hit.
+    'fragments': {
+        'BACKEND': config('FRAGMENT_CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('FRAGMENT_CACHE_LOCATION', default='fragments'),
+        'TIMEOUT': config('FRAGMENT_CACHE_TIMEOUT', default=86400, cast=int),
+        'OPTIONS': {
+            'MAX_ENTRIES': config('FRAGMENT_CACHE_MAX_ENTRIES', default=2000, cast=int),
+            'CULL_FREQUENCY': 10,
+        },
+    },
+}
+
+# Fragments larger than this are rendered but not cached
+FRAGMENT_CACHE_MAX_BYTES = config('FRAGMENT_CACHE_MAX_BYTES', default=256 * 1024, cast=int)
+
+# Seconds a per-user dashboard snapshot may be served from the cache
+DASHBOARD_CACHE_TIMEOUT = config('DASHBOARD_CACHE_TIMEOUT', default=300, cast=int)
+
+# With a shared CACHE_BACKEND, sessions are read from the cache and only fall
+# back to the database on a miss. The per-process LocMemCache keeps them in
+# the database: a cached session lives as long as SESSION_COOKIE_AGE, so a
+# logout on one worker would go unseen by the others until then (the
+# core.W001 check warns about that setup). Set
+# SESSION_ENGINE=django.contrib.sessions.backends.signed_cookies to keep
+# sessions in the cookie instead.
+SESSION_ENGINE = config(
+    'SESSION_ENGINE',
+    default='django.contrib.sessions.backends.db'
+    if CACHES['default']['BACKEND'].endswith('.LocMemCache')
+    else 'django.contrib.sessions.backends.cached_db',
+)
+
+# Seconds the user row behind request.user may be served from the cache
+AUTH_USER_CACHE_TIMEOUT = config('AUTH_USER_CACHE_TIMEOUT', default=60, cast=int)
+
+# Seconds a user's visible-project id set may be served from the cache
+ACCESS_CACHE_TIMEOUT = config('ACCESS_CACHE_TIMEOUT', default=600, cast=int)
+
+# Tasks per page on the task list
+TASK_LIST_PAGE_SIZE = config('TASK_LIST_PAGE_SIZE', default=50, cast=int)
+
+# Cards per kanban column on the project page, and per "load more" page
+KANBAN_COLUMN_SIZE = config('KANBAN_COLUMN_SIZE', default=20, cast=int)
+
+# Live board updates: seconds between change feed polls, keep-alive interval
+# of an idle stream, how long a long-poll waits, how often clients poll under
+# WSGI, and how many missed changes a client may catch up on before reloading
+LIVE_POLL_INTERVAL = config('LIVE_POLL_INTERVAL', default=1.0, cast=float)
+LIVE_HEARTBEAT_SECONDS = config('LIVE_HEARTBEAT_SECONDS', default=15, cast=int)
+LIVE_LONG_POLL_TIMEOUT = config('LIVE_LONG_POLL_TIMEOUT', default=25, cast=int)
+LIVE_SHORT_POLL_INTERVAL = config('LIVE_SHORT_POLL_INTERVAL', default=10, cast=int)
+LIVE_BACKLOG_LIMIT = config('LIVE_BACKLOG_LIMIT', default=200, cast=int)
+
+# Maximum number of status changes accepted by one bulk status request
+BULK_STATUS_MAX_CHANGES = config('BULK_STATUS_MAX_CHANGES', default=500, cast=int)
+
+# Timesheet reporting: capacity used for utilisation, and row cap per response
+WORKING_HOURS_PER_DAY = config('WORKING_HOURS_PER_DAY', default=8, cast=int)
+REPORT_MAX_ROWS = config('REPORT_MAX_ROWS', default=5000, cast=int)
+
+# Project analytics: seconds the per-project burndown state is kept in the
+# cache, and history rows fetched per chunk while bringing it up to date
+ANALYTICS_CACHE_TIMEOUT = config('ANALYTICS_CACHE_TIMEOUT', default=7 * 86400, cast=int)
+ANALYTICS_CHUNK_SIZE = config('ANALYTICS_CHUNK_SIZE', default=2000, cast=int)
+
+# Maximum number of full-text search results shown
+SEARCH_RESULTS_LIMIT = config('SEARCH_RESULTS_LIMIT', default=50, cast=int)
+
+# Task history older than this many days is moved to the archive table by
+# the archive_task_history command, this many rows per transaction
+TASK_HISTORY_RETENTION_DAYS = config('TASK_HISTORY_RETENTION_DAYS', default=180, cast=int)
+TASK_HISTORY_ARCHIVE_BATCH_SIZE = config('TASK_HISTORY_ARCHIVE_BATCH_SIZE', default=2000, cast=int)
+
+# CSV imports validate and insert this many rows per transaction, and the
+# upload page lists at most this many rejected rows
+IMPORT_BATCH_SIZE = config('IMPORT_BATCH_SIZE', default=2000, cast=int)
+IMPORT_MAX_REPORTED_ERRORS = config('IMPORT_MAX_REPORTED_ERRORS', default=200, cast=int)
+
+# Admin changelists count at most this many rows exactly
+ADMIN_EXACT_COUNT_LIMIT = config('ADMIN_EXACT_COUNT_LIMIT', default=10000, cast=int)
+
+# Per-view request metrics (exposed at /metrics/ to super admins)
+METRICS_ENABLED = config('METRICS_ENABLED', default=False, cast=bool)
+
+# Requests above these budgets are logged to the "core.metrics" logger.
+# Keys are URL names; "default" applies to every other view.
+METRICS_BUDGETS = {
+    'default': {'queries': 30, 'ms': 500},
+    'dashboard': {'queries': 10, 'ms': 250},
+    'task_list': {'queries': 10, 'ms': 300},
+    'project_detail': {'queries': 15, 'ms': 300},
+    'update_task_status': {'queries': 12, 'ms': 100},
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -92,6 +247,21 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Content-hashed file names plus .gz/.br copies, written by build_assets
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'core.assets.CompressedManifestStaticFilesStorage'},
+}
+
+# Serve STATIC_ROOT from the application (see StaticAssetMiddleware); turn off
+# when a CDN or the web server serves it. Hashed files are cached this long.
+SERVE_STATIC = config('SERVE_STATIC', default=True, cast=bool)
+STATIC_MAX_AGE = config('STATIC_MAX_AGE', default=365 * 24 * 3600, cast=int)
+
+# Command that runs the Tailwind CSS v3 CLI for build_assets: the standalone
+# binary (e.g. "./tailwindcss-linux-x64") or the npm package
+TAILWIND_CLI = config('TAILWIND_CLI', default='npx tailwindcss@3')
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -115,4 +285,10 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
+    'PAGE_SIZE': config('API_PAGE_SIZE', default=100, cast=int),
 }
+
+# Largest ?page_size= the API serves, and most objects one bulk create accepts
+API_MAX_PAGE_SIZE = config('API_MAX_PAGE_SIZE', default=5000, cast=int)
+API_BULK_MAX_ITEMS = config('API_BULK_MAX_ITEMS', default=1000, cast=int)
@@ -6,6 +6,7 @@ from django.conf.urls.static import static
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('core.urls')),
+    path('api/v1/', include('core.api_urls')),
     
     path('auth/', include('core.auth_urls')),
 ]
@@ -3,3 +3,10 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'projectmanager.settings')
 application = get_wsgi_application()
+
+# Pay the first request's import and compile costs before serving
+from django.conf import settings  # noqa: E402
+
+if settings.WARMUP_ON_STARTUP:
+    from core import warmup
+    warmup.run()
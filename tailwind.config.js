@@ -0,0 +1,10 @@
+/** @type {import('tailwindcss').Config} */
+module.exports = {
+  // Only the classes found here end up in static/css/app.css
+  // (manage.py build_assets); core/forms.py holds the form widget classes
+  content: ['./templates/**/*.html', './core/**/*.py'],
+  theme: {
+    extend: {},
+  },
+  plugins: [],
+};